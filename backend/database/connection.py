@@ -2,7 +2,10 @@
 import aiomysql
 import pymysql
 import os
-from typing import Optional
+import queue
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,8 +13,13 @@ logger = logging.getLogger(__name__)
 db_pool: Optional[aiomysql.Pool] = None
 
 
-async def get_db_pool() -> aiomysql.Pool:
-    """Get or create database connection pool"""
+async def get_db_pool(autocommit: bool = False) -> aiomysql.Pool:
+    """
+    Get or create database connection pool
+    
+    autocommit only takes effect when the pool is first created; read-only
+    scripts can enable it to skip transaction bookkeeping around SELECTs.
+    """
     global db_pool
     if db_pool is None:
         db_pool = await aiomysql.create_pool(
@@ -21,8 +29,11 @@ async def get_db_pool() -> aiomysql.Pool:
             password=os.environ.get('DB_PASSWORD', 'alumni_pass_123'),
             db=os.environ.get('DB_NAME', 'AlumUnity'),
             charset='utf8mb4',
-            autocommit=False,
+            use_unicode=True,
+            autocommit=autocommit,
             minsize=1,
+            # Must stay above the widest per-request asyncio.gather fan-out
+            # (5 connections for the admin dashboard's live aggregates)
             maxsize=10
         )
         logger.info("Database connection pool created")
@@ -39,6 +50,23 @@ async def close_db_pool():
         logger.info("Database connection pool closed")
 
 
+@asynccontextmanager
+async def acquire_for_read(pool: aiomysql.Pool) -> AsyncIterator[aiomysql.Connection]:
+    """
+    Borrow a pooled connection for SELECTs only
+    
+    Without autocommit the first SELECT opens a transaction, and aiomysql
+    closes (rather than reuses) any connection released mid-transaction.
+    Ending it here keeps read-only handlers from churning new connections.
+    """
+    async with pool.acquire() as conn:
+        try:
+            yield conn
+        finally:
+            if not conn.closed and conn.get_transaction_status():
+                await conn.rollback()
+
+
 async def get_db_connection():
     """Get database connection from pool (context manager) - FOR ASYNC USE ONLY"""
     pool = await get_db_pool()
@@ -46,19 +74,80 @@ async def get_db_connection():
         yield conn
 
 
+# Idle sync connections kept for reuse; connections returned while the pool
+# is full are closed instead
+SYNC_POOL_SIZE = int(os.environ.get('DB_SYNC_POOL_SIZE', 20))
+
+# Idle connections older than this are pinged (and reconnected) before reuse
+SYNC_POOL_PING_AFTER = 30
+
+# (connection, returned_at) pairs, most recently returned first
+_sync_pool: queue.LifoQueue = queue.LifoQueue(maxsize=SYNC_POOL_SIZE)
+
+
+class PooledConnection:
+    """
+    pymysql connection checked out of the sync pool; close() hands it back
+    to the pool instead of dropping the socket
+    """
+    
+    def __init__(self, connection: pymysql.connections.Connection):
+        self._connection = connection
+    
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self):
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        try:
+            # End any open transaction so the next borrower starts clean
+            connection.rollback()
+            _sync_pool.put_nowait((connection, time.monotonic()))
+        except (pymysql.Error, queue.Full):
+            connection.close()
+
+
+def _connect_sync() -> pymysql.connections.Connection:
+    return pymysql.connect(
+        host=os.environ.get('DB_HOST', 'localhost'),
+        port=int(os.environ.get('DB_PORT', 3306)),
+        user=os.environ.get('DB_USER', 'alumni_user'),
+        password=os.environ.get('DB_PASSWORD', 'alumni_pass_123'),
+        database=os.environ.get('DB_NAME', 'AlumUnity'),
+        charset='utf8mb4',
+        cursorclass=pymysql.cursors.DictCursor
+    )
+
+
 def get_sync_db_connection():
-    """Get synchronous database connection - FOR SYNC ROUTES"""
+    """
+    Get synchronous database connection - FOR SYNC ROUTES
+    
+    Connections come from a small reuse pool; call close() when done to
+    return them.
+    """
     try:
-        connection = pymysql.connect(
-            host=os.environ.get('DB_HOST', 'localhost'),
-            port=int(os.environ.get('DB_PORT', 3306)),
-            user=os.environ.get('DB_USER', 'alumni_user'),
-            password=os.environ.get('DB_PASSWORD', 'alumni_pass_123'),
-            database=os.environ.get('DB_NAME', 'AlumUnity'),
-            charset='utf8mb4',
-            cursorclass=pymysql.cursors.DictCursor
-        )
-        return connection
+        while True:
+            try:
+                connection, returned_at = _sync_pool.get_nowait()
+            except queue.Empty:
+                return PooledConnection(_connect_sync())
+            
+            if time.monotonic() - returned_at < SYNC_POOL_PING_AFTER:
+                return PooledConnection(connection)
+            try:
+                connection.ping(reconnect=True)
+                return PooledConnection(connection)
+            except pymysql.Error:
+                connection.close()
     except Exception as e:
         logger.error(f"Failed to create sync database connection: {str(e)}")
         raise
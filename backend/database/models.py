@@ -243,6 +243,19 @@ class RejectProfileRequest(BaseModel):
     rejection_reason: str = Field(..., min_length=10)
 
 
+class AdminActionResponse(BaseModel):
+    """Response envelope for admin actions"""
+    success: bool
+    message: str
+    data: dict
+
+
+class AdminDataResponse(BaseModel):
+    """Response envelope for admin data lookups"""
+    success: bool
+    data: dict
+
+
 # ============================================================================
 # PHASE 3: JOBS & CAREER MANAGEMENT MODELS
 # ============================================================================
@@ -0,0 +1,61 @@
+"""ETag support for cached JSON responses"""
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from typing import Any, Awaitable, Callable, Optional
+import hashlib
+import orjson
+
+from redis_client import RedisCache, RedisConfig
+
+
+def _opaque_tag(tag: str) -> str:
+    """Strip the weak-validator prefix, for weak comparison"""
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches etag (RFC 9110 section 13.1.2):
+    "*" matches anything, otherwise any entry of the comma-separated list
+    matches under weak comparison
+    """
+    if not header:
+        return False
+    header = header.strip()
+    if header == "*":
+        return True
+    etag = _opaque_tag(etag)
+    return any(_opaque_tag(tag.strip()) == etag for tag in header.split(","))
+
+
+async def etag_json_response(
+    request: Request,
+    cache_key: str,
+    build_payload: Callable[[], Awaitable[Any]],
+    ttl: int = RedisConfig.TTL_API_CACHE_SHORT,
+    prefix: str = RedisConfig.PREFIX_API_CACHE
+) -> Response:
+    """
+    Serve a JSON payload with an ETag, answering 304 when the client's
+    If-None-Match still matches.
+
+    The encoded body and its ETag are cached in Redis under prefix:cache_key,
+    so repeat hits skip both the query and the JSON encoding until the entry
+    expires or is deleted.
+    """
+    cached = await RedisCache.get(cache_key, prefix=prefix)
+    if cached is not None:
+        etag = cached["etag"]
+        body = cached["body"].encode()
+    else:
+        payload = await build_payload()
+        # jsonable_encoder only handles what orjson can't natively (e.g. Decimal)
+        body = orjson.dumps(payload, default=jsonable_encoder)
+        etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        await RedisCache.set(
+            cache_key, {"etag": etag, "body": body.decode()}, ttl=ttl, prefix=prefix
+        )
+
+    if if_none_match(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
@@ -4,7 +4,7 @@ Career path prediction and AI-powered features
 """
 from .career_model_trainer import CareerModelTrainer, train_model_from_cli
 from .model_loader import CareerModelLoader, get_model_loader, reload_model
-from .llm_advisor import CareerLLMAdvisor, get_llm_advisor
+from .llm_advisor import CareerLLMAdvisor, get_llm_advisor, close_llm_advisor
 
 __all__ = [
     'CareerModelTrainer',
@@ -13,5 +13,6 @@ __all__ = [
     'get_model_loader',
     'reload_model',
     'CareerLLMAdvisor',
-    'get_llm_advisor'
+    'get_llm_advisor',
+    'close_llm_advisor'
 ]
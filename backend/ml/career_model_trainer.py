@@ -2,22 +2,40 @@
 Career Path Prediction ML Model Trainer
 Trains Random Forest classifier for career path prediction using historical data
 """
+import asyncio
 import logging
 import json
+import os
 import joblib
+import orjson
+import aiomysql
 import numpy as np
+from scipy import sparse
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 from pathlib import Path
 from collections import Counter
+from itertools import chain
 
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import LabelEncoder, MultiLabelBinarizer
-from sklearn.model_selection import train_test_split, GridSearchCV
-from sklearn.metrics import accuracy_score, classification_report
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import train_test_split, HalvingRandomSearchCV, StratifiedShuffleSplit
+from sklearn.metrics import accuracy_score, precision_recall_fscore_support
 
 logger = logging.getLogger(__name__)
 
+# Optional GPU backend (RAPIDS cuML), only used when a CUDA device is present
+try:
+    import cupy as cp
+    from cuml.ensemble import RandomForestClassifier as CuRandomForestClassifier
+    CUML_AVAILABLE = cp.cuda.runtime.getDeviceCount() > 0
+except ImportError:
+    CUML_AVAILABLE = False
+except Exception:
+    CUML_AVAILABLE = False
+    logger.warning("cuML installed but no usable GPU found. Training will run on CPU")
+
 # Get the directory where this file is located
 _current_dir = Path(__file__).parent.resolve()
 _default_model_dir = _current_dir / "models"
@@ -28,7 +46,18 @@ class CareerModelTrainer:
     Trains ML models for career path prediction
     """
     
-    def __init__(self, model_dir: Optional[str] = None):
+    # Default-parameter forests scoring below this OOB accuracy fall back to
+    # hyperparameter search, provided there are enough samples to tune on
+    OOB_SCORE_THRESHOLD = 0.55
+    MIN_SEARCH_SAMPLES = 200
+    
+    # Largest stratified subsample the hyperparameter search is run on
+    SEARCH_SUBSAMPLE_SIZE = 5000
+    
+    # Below this many samples, GPU transfer overhead outweighs faster training
+    MIN_GPU_SAMPLES = 100000
+    
+    def __init__(self, model_dir: Optional[str] = None, min_skill_count: int = 3):
         if model_dir is None:
             self.model_dir = _default_model_dir
         else:
@@ -36,9 +65,12 @@ class CareerModelTrainer:
         self.model_dir.mkdir(parents=True, exist_ok=True)
         
         self.role_encoder = LabelEncoder()
-        self.skill_encoder = MultiLabelBinarizer()
+        self.skill_encoder = MultiLabelBinarizer(sparse_output=True)
         self.industry_encoder = LabelEncoder()
         
+        # Skills seen fewer times than this are left out of the feature vocabulary
+        self.min_skill_count = min_skill_count
+        
         self.model = None
         self.feature_names = []
         
@@ -74,7 +106,7 @@ class CareerModelTrainer:
             # Step 2: Prepare features and labels
             X, y = await self._prepare_features(training_data)
             
-            if len(X) == 0:
+            if X.shape[0] == 0:
                 return {
                     "success": False,
                     "message": "No valid features could be extracted"
@@ -93,7 +125,7 @@ class CareerModelTrainer:
                 X, y, test_size=0.2, random_state=42, stratify=y if use_stratify else None
             )
             
-            logger.info(f"Training set: {len(X_train)}, Test set: {len(X_test)}")
+            logger.info(f"Training set: {X_train.shape[0]}, Test set: {X_test.shape[0]}")
             
             # Step 4: Train model with hyperparameter tuning
             self.model = await self._train_model(X_train, y_train)
@@ -112,8 +144,8 @@ class CareerModelTrainer:
             return {
                 "success": True,
                 "model_path": str(model_path),
-                "training_samples": len(X_train),
-                "test_samples": len(X_test),
+                "training_samples": X_train.shape[0],
+                "test_samples": X_test.shape[0],
                 "metrics": metrics,
                 "trained_at": datetime.now().isoformat()
             }
@@ -122,20 +154,30 @@ class CareerModelTrainer:
             logger.error(f"Error training model: {str(e)}")
             raise
     
-    async def _extract_training_data(self, db_conn) -> List[Dict]:
+    async def _extract_training_data(self, db_conn, batch_size: int = 1000) -> List[Dict]:
         """
         Extract career transition data from database
+        
+        Rows are streamed through a server-side cursor in batches of
+        ``batch_size`` so neither the server nor the driver buffers the
+        whole result set. Skill columns that are not JSON arrays come back
+        as NULL, so each row needs a single decode and no type checks.
+        The next batch is fetched while the current one is being parsed.
         """
-        async with db_conn.cursor() as cursor:
+        training_data = []
+        
+        async with db_conn.cursor(aiomysql.SSCursor) as cursor:
             # Get career paths with associated alumni profiles
             await cursor.execute("""
                 SELECT 
                     cp.from_role,
                     cp.to_role,
-                    cp.skills_acquired,
+                    CASE WHEN JSON_TYPE(cp.skills_acquired) = 'ARRAY'
+                        THEN cp.skills_acquired END as skills_acquired,
                     cp.transition_duration_months,
                     cp.success_rating,
-                    ap.skills as current_skills,
+                    CASE WHEN JSON_TYPE(ap.skills) = 'ARRAY'
+                        THEN ap.skills END as current_skills,
                     ap.years_of_experience,
                     ap.industry,
                     ap.batch_year
@@ -146,30 +188,35 @@ class CareerModelTrainer:
                     AND cp.transition_date >= DATE_SUB(NOW(), INTERVAL 5 YEAR)
             """)
             
-            rows = await cursor.fetchall()
+            # Keep one fetch in flight while the previous batch is parsed in a
+            # worker thread, so network I/O overlaps with parsing
+            pending = asyncio.ensure_future(cursor.fetchmany(batch_size))
+            try:
+                while True:
+                    rows = await pending
+                    if not rows:
+                        break
+                    pending = asyncio.ensure_future(cursor.fetchmany(batch_size))
+                    training_data.extend(await asyncio.to_thread(self._parse_training_rows, rows))
+            finally:
+                # Never leave a read in flight when the cursor is closed
+                if not pending.done():
+                    await asyncio.gather(pending, return_exceptions=True)
         
-        training_data = []
+        return training_data
+    
+    @staticmethod
+    def _parse_training_rows(rows) -> List[Dict]:
+        """
+        Convert a batch of raw career_paths rows into training samples
+        """
+        samples = []
         for row in rows:
-            # Parse skills
-            current_skills = []
-            if row[5]:
-                try:
-                    current_skills = json.loads(row[5]) if isinstance(row[5], str) else row[5]
-                    if not isinstance(current_skills, list):
-                        current_skills = []
-                except (json.JSONDecodeError, TypeError):
-                    current_skills = []
-            
-            skills_acquired = []
-            if row[2]:
-                try:
-                    skills_acquired = json.loads(row[2]) if isinstance(row[2], str) else row[2]
-                    if not isinstance(skills_acquired, list):
-                        skills_acquired = []
-                except (json.JSONDecodeError, TypeError):
-                    skills_acquired = []
+            # Non-array JSON is already mapped to NULL by the query
+            current_skills = orjson.loads(row[5]) if row[5] else []
+            skills_acquired = orjson.loads(row[2]) if row[2] else []
             
-            training_data.append({
+            samples.append({
                 "from_role": row[0],
                 "to_role": row[1],
                 "current_skills": current_skills,
@@ -180,64 +227,82 @@ class CareerModelTrainer:
                 "industry": row[7] or "Unknown",
                 "batch_year": row[8]
             })
-        
-        return training_data
+        return samples
     
-    async def _prepare_features(self, training_data: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    async def _prepare_features(self, training_data: List[Dict]) -> Tuple[sparse.csr_matrix, np.ndarray]:
         """
         Prepare feature matrix and target labels
         """
-        # Extract all unique roles, skills, and industries
-        all_roles = list(set([d['from_role'] for d in training_data]))
-        all_skills = []
-        all_industries = list(set([d['industry'] for d in training_data]))
+        # Drop malformed samples up front with a single summary warning so the
+        # batched encoders below never see a value they can't handle
+        valid_data = [d for d in training_data if self._is_valid_sample(d)]
+        if len(valid_data) < len(training_data):
+            logger.warning(f"Skipping {len(training_data) - len(valid_data)} malformed samples")
+        training_data = valid_data
+        
+        # Sort out unique roles and industries and their integer codes in one
+        # C-level pass each; the LabelEncoders only need classes_ set to
+        # transform consistently at prediction time
+        role_classes, role_col = np.unique(
+            np.asarray([d['from_role'] for d in training_data], dtype=str), return_inverse=True
+        )
+        industry_classes, industry_col = np.unique(
+            np.asarray([d['industry'] for d in training_data], dtype=str), return_inverse=True
+        )
+        self.role_encoder.classes_ = role_classes
+        self.industry_encoder.classes_ = industry_classes
         
+        # Count skills in one pass and keep a sorted vocabulary of the frequent
+        # ones, so the long tail doesn't add a feature column per rare skill
+        skill_counts = Counter()
         for d in training_data:
-            all_skills.extend(d['current_skills'])
-        all_skills = list(set(all_skills))
-        
-        logger.info(f"Found {len(all_roles)} unique roles, {len(all_skills)} unique skills")
-        
-        # Fit encoders
-        self.role_encoder.fit(all_roles)
-        self.skill_encoder.fit([d['current_skills'] for d in training_data])
-        self.industry_encoder.fit(all_industries)
+            skill_counts.update(d['current_skills'])
+        vocabulary = sorted(
+            skill for skill, count in skill_counts.items() if count >= self.min_skill_count
+        )
         
-        # Prepare features
-        features = []
-        labels = []
+        logger.info(
+            f"Found {len(role_classes)} unique roles, {len(skill_counts)} unique skills "
+            f"({len(vocabulary)} kept)"
+        )
         
-        for data in training_data:
-            try:
-                # Encode from_role
-                role_encoded = self.role_encoder.transform([data['from_role']])[0]
-                
-                # Encode skills (multi-hot)
-                skills_encoded = self.skill_encoder.transform([data['current_skills']])[0]
-                
-                # Encode industry
-                industry_encoded = self.industry_encoder.transform([data['industry']])[0]
-                
-                # Numerical features
-                years_exp = data['years_experience']
-                duration = data['duration_months']
-                success = data['success_rating']
-                
-                # Combine all features
-                feature_vector = [
-                    role_encoded,
-                    years_exp,
-                    duration,
-                    success,
-                    industry_encoded
-                ] + skills_encoded.tolist()
-                
-                features.append(feature_vector)
-                labels.append(data['to_role'])
-            
-            except Exception as e:
-                logger.warning(f"Skipping sample due to error: {str(e)}")
-                continue
+        # Encode skills in a single batched call rather than per sample. The
+        # encoder is fitted even when no skill clears the floor, so prediction
+        # sees the same (skill-less) column layout
+        self.skill_encoder = MultiLabelBinarizer(classes=vocabulary, sparse_output=True)
+        self.skill_encoder.fit([vocabulary])
+        if vocabulary:
+            known_skills = set(vocabulary)
+            skills_mat = self.skill_encoder.transform(
+                [[skill for skill in d['current_skills'] if skill in known_skills] for d in training_data]
+            )
+        else:
+            logger.warning(
+                f"No skill appears in {self.min_skill_count}+ samples; "
+                f"training on role, experience and industry features only"
+            )
+            skills_mat = None
+        
+        # Fill the numeric columns straight into a preallocated float32 block.
+        # Trees train on float32 internally, so no per-fit cast is needed
+        n_samples = len(training_data)
+        numeric = np.empty((n_samples, 5), dtype=np.float32)
+        numeric[:, 0] = role_col
+        numeric[:, 1] = np.fromiter((d['years_experience'] for d in training_data), np.float32, n_samples)
+        numeric[:, 2] = np.fromiter((d['duration_months'] for d in training_data), np.float32, n_samples)
+        numeric[:, 3] = np.fromiter((d['success_rating'] for d in training_data), np.float32, n_samples)
+        numeric[:, 4] = industry_col
+        
+        # Skills are mostly zeros, so keep the whole matrix in CSR form
+        if skills_mat is not None:
+            features = sparse.hstack(
+                [sparse.csr_matrix(numeric), skills_mat],
+                format='csr',
+                dtype=np.float32
+            )
+        else:
+            features = sparse.csr_matrix(numeric)
+        labels = np.array([d['to_role'] for d in training_data])
         
         # Store feature names for later reference
         self.feature_names = [
@@ -248,13 +313,46 @@ class CareerModelTrainer:
             'industry_encoded'
         ] + list(self.skill_encoder.classes_)
         
-        return np.array(features), np.array(labels)
+        return features, labels
+    
+    @staticmethod
+    def _is_valid_sample(data: Dict) -> bool:
+        """
+        Check that a sample's roles are strings and its skills a list of strings
+        """
+        return (
+            isinstance(data['from_role'], str)
+            and isinstance(data['to_role'], str)
+            and isinstance(data['current_skills'], list)
+            and all(isinstance(skill, str) for skill in data['current_skills'])
+        )
     
-    async def _train_model(self, X_train: np.ndarray, y_train: np.ndarray) -> RandomForestClassifier:
+    async def _train_model(self, X_train: sparse.csr_matrix, y_train: np.ndarray) -> RandomForestClassifier:
         """
-        Train Random Forest classifier with hyperparameter tuning
+        Train Random Forest classifier
+        
+        A forest with sensible defaults is fit first and validated on its
+        out-of-bag samples. Hyperparameter search only runs when that OOB
+        score is poor and there is enough data for the search to matter.
+        Large datasets are trained on the GPU instead when cuML is available.
         """
-        logger.info("Training Random Forest model...")
+        if CUML_AVAILABLE and X_train.shape[0] >= self.MIN_GPU_SAMPLES:
+            rf = self._fit_on_gpu(X_train, y_train)
+            if rf is not None:
+                return rf
+        
+        logger.info("Training Random Forest model with default parameters...")
+        
+        rf = RandomForestClassifier(
+            max_features='sqrt',
+            min_samples_leaf=2,
+            random_state=42,
+            n_jobs=-1
+        )
+        rf = self._fit_with_early_stopping(rf, X_train, y_train, max_estimators=200)
+        
+        if rf.oob_score_ >= self.OOB_SCORE_THRESHOLD or X_train.shape[0] < self.MIN_SEARCH_SAMPLES:
+            return rf
         
         # Check if dataset is large enough for cross-validation
         # CV requires at least 2*n_splits samples per class
@@ -262,70 +360,132 @@ class CareerModelTrainer:
         min_class_count = min(y_train_counts.values()) if y_train_counts else 0
         
         # Determine CV folds based on data distribution
-        max_cv_folds = min(3, len(X_train) // 10, min_class_count)
-        
-        # If dataset is too small or imbalanced, skip grid search
-        if max_cv_folds < 2 or len(X_train) < 20:
-            logger.warning(f"Dataset too small for grid search (train size: {len(X_train)}, min class: {min_class_count})")
-            logger.info("Training with default parameters...")
-            rf = RandomForestClassifier(
-                n_estimators=100,
-                max_depth=20,
-                min_samples_split=5,
-                min_samples_leaf=2,
-                random_state=42,
-                n_jobs=-1
-            )
-            rf.fit(X_train, y_train)
+        max_cv_folds = min(3, X_train.shape[0] // 10, min_class_count)
+        
+        # If classes are too imbalanced, keep the default model
+        if max_cv_folds < 2:
+            logger.warning(f"Classes too small for hyperparameter search (min class: {min_class_count})")
             return rf
         
-        # Define parameter grid for GridSearchCV (simplified for small datasets)
-        if len(X_train) < 50:
-            # Smaller grid for small datasets
-            param_grid = {
-                'n_estimators': [50, 100],
-                'max_depth': [10, 20],
-                'min_samples_split': [2, 5],
-                'min_samples_leaf': [1, 2]
-            }
-        else:
-            # Full grid for larger datasets
-            param_grid = {
-                'n_estimators': [50, 100, 200],
-                'max_depth': [10, 20, 30, None],
-                'min_samples_split': [2, 5, 10],
-                'min_samples_leaf': [1, 2, 4]
-            }
+        logger.info(f"OOB score {rf.oob_score_:.3f} below {self.OOB_SCORE_THRESHOLD}, running hyperparameter search...")
         
-        # Base model
-        rf = RandomForestClassifier(random_state=42, n_jobs=-1)
+        # Parameter grid for the hyperparameter search
+        param_grid = {
+            'n_estimators': [50, 100, 200],
+            'max_depth': [10, 20, 30, None],
+            'min_samples_split': [2, 5, 10],
+            'min_samples_leaf': [1, 2, 4]
+        }
         
-        # Grid search with cross-validation
-        logger.info(f"Running grid search with {max_cv_folds}-fold CV...")
-        grid_search = GridSearchCV(
+        # Base model is single-threaded: the search parallelizes across
+        # candidates, and nesting n_jobs=-1 inside it oversubscribes the cores
+        rf = RandomForestClassifier(random_state=42, n_jobs=1)
+        
+        # Hyperparameter rankings settle well before the full dataset, so tune
+        # on a stratified subsample and refit the winner on everything
+        X_search, y_search = X_train, y_train
+        if X_train.shape[0] > self.SEARCH_SUBSAMPLE_SIZE:
+            splitter = StratifiedShuffleSplit(
+                n_splits=1, train_size=self.SEARCH_SUBSAMPLE_SIZE, random_state=42
+            )
+            subsample_idx, _ = next(splitter.split(X_train, y_train))
+            X_search, y_search = X_train[subsample_idx], y_train[subsample_idx]
+        
+        # Successive halving: candidates start on a small sample and only the
+        # best survivors are promoted to the full search set
+        logger.info(f"Running halving search with {max_cv_folds}-fold CV on {X_search.shape[0]} samples...")
+        search = HalvingRandomSearchCV(
             rf,
-            param_grid,
+            param_distributions=param_grid,
+            factor=3,
+            resource='n_samples',
+            min_resources=max(20, X_search.shape[0] // 10),
             cv=max_cv_folds,
             scoring='accuracy',
+            refit=False,
             n_jobs=-1,
+            random_state=42,
             verbose=1
         )
         
-        grid_search.fit(X_train, y_train)
+        search.fit(X_search, y_search)
+        
+        logger.info(f"Best parameters: {search.best_params_}")
+        logger.info(f"Best CV score: {search.best_score_:.3f}")
+        
+        best_rf = RandomForestClassifier(**search.best_params_, random_state=42, n_jobs=-1)
+        best_rf.fit(X_train, y_train)
+        
+        return best_rf
+    
+    def _fit_on_gpu(self, X_train: sparse.csr_matrix, y_train: np.ndarray) -> Optional[RandomForestClassifier]:
+        """
+        Fit the forest with cuML and convert it to a scikit-learn model so the
+        saved artifact still loads on CPU-only hosts
+        
+        Returns None if GPU training or the conversion fails, in which case
+        the caller falls back to CPU training.
+        """
+        logger.info("Training Random Forest model on GPU (cuML)...")
+        
+        # cuML wants dense float32 features and integer labels
+        label_encoder = LabelEncoder()
+        y_encoded = label_encoder.fit_transform(y_train).astype(np.int32)
+        X_dense = X_train.toarray() if sparse.issparse(X_train) else X_train
+        
+        try:
+            gpu_rf = CuRandomForestClassifier(
+                n_estimators=200,
+                max_depth=20,
+                max_features='sqrt',
+                random_state=42
+            )
+            gpu_rf.fit(cp.asarray(X_dense, dtype=cp.float32), cp.asarray(y_encoded))
+            rf = gpu_rf.as_sklearn()
+        except Exception as e:
+            logger.warning(f"GPU training failed, falling back to CPU: {str(e)}")
+            return None
         
-        logger.info(f"Best parameters: {grid_search.best_params_}")
-        logger.info(f"Best CV score: {grid_search.best_score_:.3f}")
+        # Map the integer classes back to role names
+        rf.classes_ = label_encoder.classes_
+        return rf
+    
+    def _fit_with_early_stopping(
+        self,
+        rf: RandomForestClassifier,
+        X_train: sparse.csr_matrix,
+        y_train: np.ndarray,
+        step: int = 20,
+        max_estimators: int = 200,
+        tol: float = 1e-3
+    ) -> RandomForestClassifier:
+        """
+        Grow the forest ``step`` trees at a time and stop once the OOB score
+        improves by less than ``tol``
+        """
+        rf.set_params(warm_start=True, oob_score=True, bootstrap=True)
+        
+        prev_score = -np.inf
+        for n_estimators in range(step, max_estimators + 1, step):
+            rf.set_params(n_estimators=n_estimators)
+            rf.fit(X_train, y_train)
+            if rf.oob_score_ - prev_score < tol:
+                break
+            prev_score = rf.oob_score_
         
-        return grid_search.best_estimator_
+        logger.info(f"Stopped at {rf.n_estimators} trees (OOB score: {rf.oob_score_:.3f})")
+        return rf
     
-    async def _evaluate_model(self, X_test: np.ndarray, y_test: np.ndarray) -> Dict:
+    async def _evaluate_model(self, X_test: sparse.csr_matrix, y_test: np.ndarray) -> Dict:
         """
         Evaluate model performance
         """
         y_pred = self.model.predict(X_test)
         
         accuracy = accuracy_score(y_test, y_pred)
-        report = classification_report(y_test, y_pred, output_dict=True, zero_division=0)
+        precision, recall, f1, _ = precision_recall_fscore_support(
+            y_test, y_pred, average='weighted', zero_division=0
+        )
         
         # Get feature importances
         feature_importance = dict(zip(
@@ -342,23 +502,24 @@ class CareerModelTrainer:
         
         return {
             "accuracy": float(accuracy),
-            "precision": float(report['weighted avg']['precision']),
-            "recall": float(report['weighted avg']['recall']),
-            "f1_score": float(report['weighted avg']['f1-score']),
+            "precision": float(precision),
+            "recall": float(recall),
+            "f1_score": float(f1),
             "top_features": [{"feature": f, "importance": i} for f, i in top_features]
         }
     
     async def _save_model(self) -> Path:
         """
         Save trained model and encoders to disk
+        
+        Each file is written under a temporary name and moved into place with
+        os.replace. Encoders go first, so a model file that the loader can
+        discover always has its matching encoders next to it.
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         model_path = self.model_dir / f"career_predictor_{timestamp}.pkl"
         encoders_path = self.model_dir / f"encoders_{timestamp}.pkl"
         
-        # Save model
-        joblib.dump(self.model, model_path)
-        
         # Save encoders
         encoders = {
             'role_encoder': self.role_encoder,
@@ -366,13 +527,29 @@ class CareerModelTrainer:
             'industry_encoder': self.industry_encoder,
             'feature_names': self.feature_names
         }
-        joblib.dump(encoders, encoders_path)
+        self._dump_atomic(encoders, encoders_path)
+        
+        # Save model (compressed: forest node/value arrays shrink ~5-10x)
+        self._dump_atomic(self.model, model_path)
         
         logger.info(f"Model saved to: {model_path}")
         logger.info(f"Encoders saved to: {encoders_path}")
         
         return model_path
     
+    @staticmethod
+    def _dump_atomic(obj, path: Path):
+        """
+        Write a compressed joblib pickle to path without exposing a partial file
+        """
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            joblib.dump(obj, tmp_path, compress=3)
+            os.replace(tmp_path, path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    
     async def _save_model_metadata(self, db_conn, metrics: Dict, model_path: Path):
         """
         Store model metadata in database
@@ -409,7 +586,8 @@ class CareerModelTrainer:
             
             # Get all career paths
             async with db_conn.cursor() as cursor:
-                # Calculate transitions
+                # Calculate transitions; probabilities are normalized per
+                # from_role by the window function
                 await cursor.execute("""
                     SELECT 
                         from_role,
@@ -417,7 +595,8 @@ class CareerModelTrainer:
                         COUNT(*) as transition_count,
                         AVG(transition_duration_months) as avg_duration,
                         AVG(success_rating) as avg_success,
-                        JSON_ARRAYAGG(skills_acquired) as required_skills
+                        JSON_ARRAYAGG(skills_acquired) as required_skills,
+                        COUNT(*) / SUM(COUNT(*)) OVER (PARTITION BY from_role) as probability
                     FROM career_paths
                     WHERE from_role IS NOT NULL 
                         AND to_role IS NOT NULL
@@ -432,67 +611,63 @@ class CareerModelTrainer:
                 logger.warning("No transitions found for matrix calculation")
                 return {"success": False, "message": "No transition data available"}
             
-            # Calculate probabilities
-            role_totals = {}
+            # Build upsert rows
+            calculated_at = datetime.now()
+            rows = []
             for trans in transitions:
                 from_role = trans[0]
-                role_totals[from_role] = role_totals.get(from_role, 0) + trans[2]
+                to_role = trans[1]
+                count = trans[2]
+                avg_duration = int(trans[3]) if trans[3] else 24
+                avg_success = float(trans[4]) if trans[4] else 0.7
+                probability = float(trans[6])
+                
+                # Extract and flatten skills
+                required_skills = []
+                if trans[5]:
+                    try:
+                        skills_data = json.loads(trans[5]) if isinstance(trans[5], str) else trans[5]
+                        # Flatten nested arrays, de-duplicating in first-seen order
+                        flat_skills = chain.from_iterable(
+                            skill_set for skill_set in skills_data if isinstance(skill_set, list)
+                        )
+                        required_skills = list(dict.fromkeys(flat_skills))[:10]  # Limit to top 10
+                    except (json.JSONDecodeError, TypeError):
+                        required_skills = []
+                
+                rows.append((
+                    from_role, to_role, count, probability,
+                    avg_duration, json.dumps(required_skills), avg_success, calculated_at
+                ))
             
-            # Insert into transition matrix
-            inserted = 0
+            # Insert or update in batches; the placeholder-only VALUES tuple lets
+            # the driver send each batch as a single multi-row INSERT
             async with db_conn.cursor() as cursor:
-                for trans in transitions:
-                    from_role = trans[0]
-                    to_role = trans[1]
-                    count = trans[2]
-                    avg_duration = int(trans[3]) if trans[3] else 24
-                    avg_success = float(trans[4]) if trans[4] else 0.7
-                    
-                    # Calculate probability
-                    probability = count / role_totals[from_role]
-                    
-                    # Extract and flatten skills
-                    required_skills = []
-                    if trans[5]:
-                        try:
-                            skills_data = json.loads(trans[5]) if isinstance(trans[5], str) else trans[5]
-                            # Flatten nested arrays
-                            for skill_set in skills_data:
-                                if isinstance(skill_set, list):
-                                    required_skills.extend(skill_set)
-                            required_skills = list(set(required_skills))[:10]  # Limit to top 10
-                        except (json.JSONDecodeError, TypeError):
-                            required_skills = []
-                    
-                    # Insert or update
-                    await cursor.execute("""
+                for i in range(0, len(rows), 500):
+                    await cursor.executemany("""
                         INSERT INTO career_transition_matrix 
                         (from_role, to_role, transition_count, transition_probability, 
                          avg_duration_months, required_skills, success_rate, last_calculated)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
                         ON DUPLICATE KEY UPDATE
-                            transition_count = %s,
-                            transition_probability = %s,
-                            avg_duration_months = %s,
-                            required_skills = %s,
-                            success_rate = %s,
-                            last_calculated = NOW()
-                    """, (
-                        from_role, to_role, count, probability,
-                        avg_duration, json.dumps(required_skills), avg_success,
-                        count, probability, avg_duration, json.dumps(required_skills), avg_success
-                    ))
-                    
-                    inserted += 1
+                            transition_count = VALUES(transition_count),
+                            transition_probability = VALUES(transition_probability),
+                            avg_duration_months = VALUES(avg_duration_months),
+                            required_skills = VALUES(required_skills),
+                            success_rate = VALUES(success_rate),
+                            last_calculated = VALUES(last_calculated)
+                    """, rows[i:i + 500])
                 
                 await db_conn.commit()
             
+            inserted = len(rows)
+            
             logger.info(f"Transition matrix updated: {inserted} transitions")
             
             return {
                 "success": True,
                 "transitions_calculated": inserted,
-                "unique_from_roles": len(role_totals),
+                "unique_from_roles": len({trans[0] for trans in transitions}),
                 "calculated_at": datetime.now().isoformat()
             }
         
@@ -5,7 +5,11 @@ Run this to see current system status and data availability
 (ASCII-safe: no emojis; Windows/CI friendly)
 """
 import asyncio
+import contextlib
+import io
+import json
 import sys
+import time
 from pathlib import Path
 
 # Add backend to path
@@ -14,61 +18,154 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from database.connection import get_db_pool, close_db_pool
 from ml.model_loader import get_model_loader
 
+# Above this many transitions the career_paths scans start to dominate
+LARGE_TABLE_ROWS = 100000
 
-async def check_system_status():
-    """Check ML system status"""
-    print("\n" + "=" * 70)
-    print("  CAREER PREDICTION SYSTEM STATUS CHECK")
-    print("=" * 70 + "\n")
+DATABASE_STATUS_REPORT = """
+{rule}
+  DATABASE STATUS
+{rule}
+  Career Transitions: {transitions}  {status_icon}
+  Unique Source Roles: {unique_from_roles}
+  Unique Target Roles: {unique_to_roles}
+  Transition Matrix Entries: {matrix_entries}
+  Alumni with Skills: {alumni_with_skills}
+{index_tip}{rule}"""
 
-    pool = None
+INDEX_TIP = """\
+  [TIP] Add a composite index so the role counts scan the index only:
+     CREATE INDEX idx_career_paths_roles ON career_paths(from_role, to_role);
+"""
+
+# Top transitions are cached between runs while career_paths is unchanged
+CACHE_FILE = Path(__file__).parent / ".status_cache.json"
+CACHE_TTL_SECONDS = 3600
 
+
+def _load_cached_transitions(fingerprint):
+    """Return cached top transitions if they match the current data, else None"""
     try:
-        # Connect to database
-        print("[WAIT] Connecting to database...")
-        pool = await get_db_pool()
-        print("[OK] Database connected\n")
+        cached = json.loads(CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+
+    if cached.get("fingerprint") != fingerprint:
+        return None
+    if time.time() - cached.get("saved_at", 0) > CACHE_TTL_SECONDS:
+        return None
+    return cached.get("top_transitions")
+
 
-        async with pool.acquire() as conn:
-            async with conn.cursor() as cursor:
+def _save_cached_transitions(fingerprint, top_transitions):
+    """Persist top transitions for the next run; failures are not fatal"""
+    try:
+        CACHE_FILE.write_text(json.dumps({
+            "fingerprint": fingerprint,
+            "saved_at": time.time(),
+            "top_transitions": [list(trans) for trans in top_transitions],
+        }))
+    except OSError:
+        pass
+
+
+async def _fetch_one(pool, query):
+    """Run a single-row query on its own pooled connection"""
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute(query)
+            return await cursor.fetchone()
+
+
+async def _career_paths_status(pool):
+    """
+    Return (transitions, unique_from_roles, unique_to_roles, top_transitions)
+    using one connection and cursor for both career_paths queries
+    """
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                SELECT
+                    COALESCE(SUM(from_role IS NOT NULL AND to_role IS NOT NULL), 0),
+                    COUNT(DISTINCT from_role),
+                    COUNT(DISTINCT to_role),
+                    MAX(created_at)
+                FROM career_paths
+                """
+            )
+            transitions, unique_from_roles, unique_to_roles, last_path_added = (
+                await cursor.fetchone()
+            )
+            transitions = int(transitions)
+
+            # Top transitions for the quick stats; skip the GROUP BY when
+            # nothing changed since the last run
+            fingerprint = [transitions, str(last_path_added)]
+            top_transitions = _load_cached_transitions(fingerprint) or []
+            if transitions > 0 and not top_transitions:
                 await cursor.execute(
                     """
-                    SELECT COUNT(*) FROM career_paths
+                    SELECT from_role, to_role, COUNT(*) as count
+                    FROM career_paths
                     WHERE from_role IS NOT NULL AND to_role IS NOT NULL
+                    GROUP BY from_role, to_role
+                    ORDER BY count DESC
+                    LIMIT 5
                     """
                 )
-                transitions = (await cursor.fetchone())[0]
+                top_transitions = await cursor.fetchall()
+                _save_cached_transitions(fingerprint, top_transitions)
 
-                await cursor.execute(
-                    """
-                    SELECT COUNT(DISTINCT from_role) FROM career_paths
-                    WHERE from_role IS NOT NULL
-                    """
-                )
-                unique_from_roles = (await cursor.fetchone())[0]
+    return transitions, unique_from_roles, unique_to_roles, top_transitions
 
-                await cursor.execute(
-                    """
-                    SELECT COUNT(DISTINCT to_role) FROM career_paths
-                    WHERE to_role IS NOT NULL
-                    """
-                )
-                unique_to_roles = (await cursor.fetchone())[0]
 
-                await cursor.execute("SELECT COUNT(*) FROM career_transition_matrix")
-                matrix_entries = (await cursor.fetchone())[0]
+async def check_system_status():
+    """Check ML system status, writing the report to stdout in one go"""
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            await _report_system_status()
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
 
-                await cursor.execute(
-                    """
-                    SELECT COUNT(*) FROM alumni_profiles
-                    WHERE skills IS NOT NULL
-                    """
-                )
-                alumni_with_skills = (await cursor.fetchone())[0]
+
+async def _report_system_status():
+    """Print the ML system status report"""
+    # Loading the model from disk is independent of the DB queries, so let
+    # it run in a worker thread meanwhile
+    model_task = asyncio.create_task(asyncio.to_thread(get_model_loader))
+
+    print("\n" + "=" * 70)
+    print("  CAREER PREDICTION SYSTEM STATUS CHECK")
+    print("=" * 70 + "\n")
+
+    pool = None
+
+    try:
+        # Connect to database
+        print("[WAIT] Connecting to database...")
+        pool = await get_db_pool(autocommit=True)
+        print("[OK] Database connected\n")
+
+        # The three tables are independent, so count them concurrently on
+        # separate pooled connections; career_paths is still read only once
+        (
+            (transitions, unique_from_roles, unique_to_roles, top_transitions),
+            (matrix_entries,),
+            (alumni_with_skills,),
+        ) = await asyncio.gather(
+            _career_paths_status(pool),
+            _fetch_one(pool, "SELECT COUNT(*) FROM career_transition_matrix"),
+            _fetch_one(
+                pool,
+                "SELECT COUNT(*) FROM alumni_profiles WHERE skills IS NOT NULL",
+            ),
+        )
 
         # Check ML model status
         print("[ML] Checking ML model status...")
-        model_loader = get_model_loader()
+        model_loader = await model_task
         ml_available = model_loader.is_loaded()
 
         if ml_available:
@@ -79,21 +176,21 @@ async def check_system_status():
         else:
             print("[INFO] ML Model: NOT LOADED (using rule-based)")
 
-        print("\n" + "-" * 70)
-        print("  DATABASE STATUS")
-        print("-" * 70)
-
         if transitions >= 50:
             status_icon = "[READY]"
         else:
             status_icon = f"[WAIT] (need {50 - transitions} more)"
 
-        print(f"  Career Transitions: {transitions}  {status_icon}")
-        print(f"  Unique Source Roles: {unique_from_roles}")
-        print(f"  Unique Target Roles: {unique_to_roles}")
-        print(f"  Transition Matrix Entries: {matrix_entries}")
-        print(f"  Alumni with Skills: {alumni_with_skills}")
-        print("-" * 70)
+        print(DATABASE_STATUS_REPORT.format_map({
+            "rule": "-" * 70,
+            "transitions": transitions,
+            "status_icon": status_icon,
+            "unique_from_roles": unique_from_roles,
+            "unique_to_roles": unique_to_roles,
+            "matrix_entries": matrix_entries,
+            "alumni_with_skills": alumni_with_skills,
+            "index_tip": INDEX_TIP if transitions >= LARGE_TABLE_ROWS else "",
+        }))
 
         # Determine system mode
         print("\n" + "-" * 70)
@@ -153,20 +250,6 @@ async def check_system_status():
             print("  TOP CAREER TRANSITIONS")
             print("-" * 70)
 
-            async with pool.acquire() as conn:
-                async with conn.cursor() as cursor:
-                    await cursor.execute(
-                        """
-                        SELECT from_role, to_role, COUNT(*) as count
-                        FROM career_paths
-                        WHERE from_role IS NOT NULL AND to_role IS NOT NULL
-                        GROUP BY from_role, to_role
-                        ORDER BY count DESC
-                        LIMIT 5
-                        """
-                    )
-                    top_transitions = await cursor.fetchall()
-
             if top_transitions:
                 for trans in top_transitions:
                     print(f"  {trans[0]:25} -> {trans[1]:25} ({trans[2]}x)")
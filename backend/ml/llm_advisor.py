@@ -4,9 +4,15 @@ Uses Gemini AI to generate personalized career advice
 """
 import logging
 import os
+import re
 import json
+import time
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, List, Optional
-import asyncio
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +25,33 @@ except ImportError:
     GEMINI_AVAILABLE = False
     logger.warning("google-generativeai not installed. LLM advice will be disabled")
 
+# Skill importance by category, matched case-insensitively anywhere in the skill
+_HIGH_PRIORITY_RE = re.compile(r'leadership|management|architecture|strategy', re.IGNORECASE)
+_MEDIUM_PRIORITY_RE = re.compile(r'communication|collaboration|problem solving', re.IGNORECASE)
+
+CAREER_ADVICE_PROMPT = """You are a career advisor for an alumni network. Generate personalized, actionable career advice.
+
+**Current Profile:**
+- Role: {current_role}
+- Company: {current_company}
+- Years of Experience: {years_exp}
+- Industry: {industry}
+- Skills: {skills}
+
+**Predicted Career Paths:**
+{predictions_text}
+
+**Similar Alumni Success Stories:**
+{alumni_text}
+
+**Task:** Provide concise, actionable career advice (3-4 sentences) that:
+1. Acknowledges their current position and strengths
+2. Highlights the most promising career path based on predictions
+3. Suggests 2-3 specific skills to develop for that path
+4. Mentions a realistic timeframe for the transition
+
+Keep the tone encouraging and professional. Focus on actionable next steps."""
+
 
 class CareerLLMAdvisor:
     """
@@ -26,6 +59,22 @@ class CareerLLMAdvisor:
     Falls back to Emergent LLM if Gemini is unavailable
     """
     
+    # Generated advice is reused for identical prompts for up to an hour
+    ADVICE_CACHE_SIZE = 1024
+    ADVICE_CACHE_TTL = 3600
+    
+    # Gemini request settings, built once at import
+    GEMINI_GENERATION_CONFIG = {
+        'temperature': 0.7,
+        'max_output_tokens': 300,
+    }
+    GEMINI_SAFETY_SETTINGS = {
+        HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+    } if GEMINI_AVAILABLE else {}
+    
     def __init__(self):
         # Try Gemini first (primary)
         self.gemini_key = os.getenv('GEMINI_API_KEY')
@@ -47,6 +96,12 @@ class CareerLLMAdvisor:
         self.emergent_url = os.getenv('EMERGENT_LLM_API_URL', 'https://api.emergent.ai/v1/chat/completions')
         self.emergent_model = os.getenv('EMERGENT_LLM_MODEL', 'gpt-4')
         
+        # Shared HTTP session for Emergent calls, created on first use
+        self._session = None
+        
+        # prompt hash -> (expires_at, advice), oldest first
+        self._advice_cache = OrderedDict()
+        
         if not self.gemini_model and not self.emergent_key:
             logger.warning("No LLM API configured (Gemini or Emergent). LLM advice will be disabled")
     
@@ -75,6 +130,12 @@ class CareerLLMAdvisor:
             # Prepare context for LLM
             prompt = self._build_prompt(user_profile, predictions, similar_alumni)
             
+            # The prompt captures everything the advice depends on
+            cache_key = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+            cached = self._get_cached_advice(cache_key)
+            if cached is not None:
+                return cached
+            
             # Try Gemini first, then Emergent LLM as fallback
             if self.gemini_model:
                 advice = await self._call_gemini_api(prompt)
@@ -83,12 +144,38 @@ class CareerLLMAdvisor:
             else:
                 return self._generate_fallback_advice(user_profile, predictions)
             
+            self._cache_advice(cache_key, advice)
             return advice
         
         except Exception as e:
             logger.error(f"Error generating LLM advice: {str(e)}")
             return self._generate_fallback_advice(user_profile, predictions)
     
+    def _get_cached_advice(self, key: str) -> Optional[str]:
+        """
+        Return cached advice for a prompt hash, or None if missing/expired
+        """
+        entry = self._advice_cache.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, advice = entry
+        if expires_at < time.monotonic():
+            del self._advice_cache[key]
+            return None
+        
+        self._advice_cache.move_to_end(key)
+        return advice
+    
+    def _cache_advice(self, key: str, advice: str):
+        """
+        Store generated advice, evicting the least recently used entry when full
+        """
+        self._advice_cache[key] = (time.monotonic() + self.ADVICE_CACHE_TTL, advice)
+        self._advice_cache.move_to_end(key)
+        if len(self._advice_cache) > self.ADVICE_CACHE_SIZE:
+            self._advice_cache.popitem(last=False)
+    
     def _build_prompt(
         self,
         user_profile: Dict,
@@ -106,39 +193,26 @@ class CareerLLMAdvisor:
         industry = user_profile.get('industry', 'Unknown')
         
         # Format predictions
-        predictions_text = "\n".join([
+        predictions_text = "\n".join(
             f"- {p['role']} (probability: {p['probability']:.1%}, timeframe: {p.get('timeframe_months', 24)} months)"
             for p in predictions[:3]
-        ])
+        )
         
         # Format similar alumni
-        alumni_text = "\n".join([
+        alumni_text = "\n".join(
             f"- {a['name']} transitioned from similar background to {a['current_role']} at {a['current_company']}"
             for a in similar_alumni[:3]
-        ]) if similar_alumni else "No similar alumni found"
+        ) if similar_alumni else "No similar alumni found"
         
-        prompt = f"""You are a career advisor for an alumni network. Generate personalized, actionable career advice.
-
-**Current Profile:**
-- Role: {current_role}
-- Company: {current_company}
-- Years of Experience: {years_exp}
-- Industry: {industry}
-- Skills: {', '.join(skills[:8])}
-
-**Predicted Career Paths:**
-{predictions_text}
-
-**Similar Alumni Success Stories:**
-{alumni_text}
-
-**Task:** Provide concise, actionable career advice (3-4 sentences) that:
-1. Acknowledges their current position and strengths
-2. Highlights the most promising career path based on predictions
-3. Suggests 2-3 specific skills to develop for that path
-4. Mentions a realistic timeframe for the transition
-
-Keep the tone encouraging and professional. Focus on actionable next steps."""
+        prompt = CAREER_ADVICE_PROMPT.format(
+            current_role=current_role,
+            current_company=current_company,
+            years_exp=years_exp,
+            industry=industry,
+            skills=', '.join(skills[:8]) if isinstance(skills, list) else '',
+            predictions_text=predictions_text,
+            alumni_text=alumni_text
+        )
 
         return prompt
     
@@ -147,25 +221,13 @@ Keep the tone encouraging and professional. Focus on actionable next steps."""
         Call Gemini AI API (Primary method)
         """
         try:
-            # Run sync Gemini call in executor to avoid blocking
-            def _generate():
-                response = self.gemini_model.generate_content(
-                    prompt,
-                    generation_config={
-                        'temperature': 0.7,
-                        'max_output_tokens': 300,
-                    },
-                    safety_settings={
-                        HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                        HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                        HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-                        HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                    }
-                )
-                return response.text.strip()
-            
-            # Execute in thread pool to avoid blocking
-            advice = await asyncio.to_thread(_generate)
+            # Native async call, so no thread pool worker is held while waiting
+            response = await self.gemini_model.generate_content_async(
+                prompt,
+                generation_config=self.GEMINI_GENERATION_CONFIG,
+                safety_settings=self.GEMINI_SAFETY_SETTINGS
+            )
+            advice = response.text.strip()
             
             if not advice:
                 raise Exception("Empty response from Gemini API")
@@ -177,12 +239,30 @@ Keep the tone encouraging and professional. Focus on actionable next steps."""
             logger.error(f"Gemini API error: {str(e)}")
             raise
     
-    async def _call_emergent_api(self, prompt: str) -> str:
+    async def _get_session(self):
         """
-        Call Emergent LLM API (Fallback method)
+        Get the shared HTTP session, creating it on first use so
+        keep-alive connections are reused across calls
         """
         import aiohttp
         
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def _call_emergent_api(self, prompt: str) -> str:
+        """
+        Call Emergent LLM API (Fallback method)
+        """
         headers = {
             'Authorization': f'Bearer {self.emergent_key}',
             'Content-Type': 'application/json'
@@ -204,28 +284,27 @@ Keep the tone encouraging and professional. Focus on actionable next steps."""
             'max_tokens': 300
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                self.emergent_url,
-                headers=headers,
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(f"Emergent LLM API error: {response.status} - {error_text}")
-                    raise Exception(f"Emergent LLM API returned status {response.status}")
-                
-                data = await response.json()
-                
-                # Extract advice from response
-                advice = data.get('choices', [{}])[0].get('message', {}).get('content', '')
-                
-                if not advice:
-                    raise Exception("Empty response from Emergent LLM API")
-                
-                logger.info("✅ Generated career advice using Emergent LLM (fallback)")
-                return advice.strip()
+        session = await self._get_session()
+        async with session.post(
+            self.emergent_url,
+            headers=headers,
+            data=orjson.dumps(payload)
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(f"Emergent LLM API error: {response.status} - {error_text}")
+                raise Exception(f"Emergent LLM API returned status {response.status}")
+            
+            data = orjson.loads(await response.read())
+            
+            # Extract advice from response
+            advice = data.get('choices', [{}])[0].get('message', {}).get('content', '')
+            
+            if not advice:
+                raise Exception("Empty response from Emergent LLM API")
+            
+            logger.info("✅ Generated career advice using Emergent LLM (fallback)")
+            return advice.strip()
     
     def _generate_fallback_advice(
         self,
@@ -281,21 +360,18 @@ Keep the tone encouraging and professional. Focus on actionable next steps."""
         Returns:
             Dict with learning path recommendations
         """
-        # Calculate skill gap
-        current_set = set(current_skills)
-        required_set = set(required_skills)
-        missing_skills = list(required_set - current_set)
+        # Calculate and prioritize the skill gap (cached per distinct input)
+        priority_order = list(self._learning_path(
+            target_role, frozenset(current_skills), tuple(required_skills)
+        ))
         
-        if not missing_skills:
+        if not priority_order:
             return {
                 "skills_to_learn": [],
                 "message": "You already have all the required skills!",
                 "estimated_time": "0 months"
             }
         
-        # Prioritize skills (this is simplified - could use LLM for better prioritization)
-        priority_order = self._prioritize_skills(missing_skills, target_role)
-        
         return {
             "target_role": target_role,
             "skills_to_learn": priority_order,
@@ -306,23 +382,30 @@ Keep the tone encouraging and professional. Focus on actionable next steps."""
             )
         }
     
-    def _prioritize_skills(self, skills: List[str], target_role: str) -> List[str]:
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _learning_path(target_role: str, current_skills: frozenset, required_skills: tuple) -> tuple:
         """
-        Prioritize skills based on role requirements (simplified rule-based)
+        Missing skills for a target role in priority order
         """
-        # Define skill importance by category
-        high_priority = ['leadership', 'management', 'architecture', 'strategy']
-        medium_priority = ['communication', 'collaboration', 'problem solving']
+        missing_skills = list(set(required_skills) - current_skills)
         
+        # Prioritize skills (this is simplified - could use LLM for better prioritization)
+        return tuple(CareerLLMAdvisor._prioritize_skills(missing_skills, target_role))
+    
+    @staticmethod
+    def _prioritize_skills(skills: List[str], target_role: str) -> List[str]:
+        """
+        Prioritize skills based on role requirements (simplified rule-based)
+        """
         high = []
         medium = []
         other = []
         
         for skill in skills:
-            skill_lower = skill.lower()
-            if any(hp in skill_lower for hp in high_priority):
+            if _HIGH_PRIORITY_RE.search(skill):
                 high.append(skill)
-            elif any(mp in skill_lower for mp in medium_priority):
+            elif _MEDIUM_PRIORITY_RE.search(skill):
                 medium.append(skill)
             else:
                 other.append(skill)
@@ -344,3 +427,11 @@ def get_llm_advisor() -> CareerLLMAdvisor:
         _advisor = CareerLLMAdvisor()
     
     return _advisor
+
+
+async def close_llm_advisor():
+    """
+    Close the global LLM advisor's HTTP session, if one was created
+    """
+    if _advisor is not None:
+        await _advisor.close()
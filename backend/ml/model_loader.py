@@ -6,16 +6,14 @@ import logging
 import joblib
 import json
 import os
+import time
 from pathlib import Path
 from typing import Optional, Dict, List
 import numpy as np
+from scipy import sparse
 
 logger = logging.getLogger(__name__)
 
-# Get the directory where this file is located
-_current_dir = Path(__file__).parent.resolve()
-_default_model_dir = _current_dir / "models"
-
 
 class CareerModelLoader:
     """
@@ -23,14 +21,27 @@ class CareerModelLoader:
     """
     
     def __init__(self, model_dir: Optional[str] = None):
-        if model_dir is None:
-            self.model_dir = _default_model_dir
-        else:
-            self.model_dir = Path(model_dir)
+        # Default to the models/ directory next to this file
+        self.model_dir = Path(model_dir) if model_dir else Path(__file__).parent / "models"
         self.model = None
         self.encoders = None
         self.feature_names = []
         
+        # label -> encoded index, built once per loaded encoder set
+        self._role_index = {}
+        self._industry_index = {}
+        
+        # Skills the encoder knows; the trainer's frequency floor drops rare ones
+        self._skill_vocab = frozenset()
+        
+        # (path, mtime) of the loaded model, to skip no-op reloads
+        self._loaded_path = None
+        self._loaded_mtime = None
+        
+        # warning key -> last time it was logged, to rate-limit repeats
+        self._warned = {}
+        self._warn_ttl = 60
+        
         logger.info(f"CareerModelLoader initialized with model_dir: {self.model_dir}")
     
     def load_latest_model(self) -> bool:
@@ -45,13 +56,28 @@ class CareerModelLoader:
                 logger.warning(f"Model directory not found: {self.model_dir}")
                 return False
             
-            # Find latest model file
-            model_files = sorted(self.model_dir.glob("career_predictor_*.pkl"))
-            if not model_files:
+            # Find latest model file; names carry the timestamp, so the
+            # greatest name is the newest model
+            with os.scandir(self.model_dir) as entries:
+                model_names = [
+                    entry.name for entry in entries
+                    if entry.name.startswith("career_predictor_") and entry.name.endswith(".pkl")
+                ]
+            if not model_names:
                 logger.warning("No trained models found")
                 return False
             
-            latest_model = model_files[-1]
+            latest_model = self.model_dir / max(model_names)
+            latest_mtime = latest_model.stat().st_mtime_ns
+            
+            # Already loaded and unchanged on disk
+            if (
+                self.is_loaded()
+                and latest_model == self._loaded_path
+                and latest_mtime == self._loaded_mtime
+            ):
+                logger.info(f"Model already up to date: {latest_model}")
+                return True
             
             # Find corresponding encoder file
             timestamp = latest_model.stem.split("_")[-2] + "_" + latest_model.stem.split("_")[-1]
@@ -61,10 +87,23 @@ class CareerModelLoader:
                 logger.error(f"Encoder file not found: {encoder_file}")
                 return False
             
-            # Load model and encoders
-            self.model = joblib.load(latest_model)
-            self.encoders = joblib.load(encoder_file)
+            # Load model and encoders; only swap them in once both succeed so a
+            # failed reload keeps serving the previous model
+            model = joblib.load(latest_model)
+            encoders = joblib.load(encoder_file)
+            self.model = model
+            self.encoders = encoders
             self.feature_names = self.encoders.get('feature_names', [])
+            self._role_index = {
+                label: i for i, label in enumerate(self.encoders['role_encoder'].classes_.tolist())
+            }
+            self._industry_index = {
+                label: i for i, label in enumerate(self.encoders['industry_encoder'].classes_.tolist())
+            }
+            self._skill_vocab = frozenset(self.encoders['skill_encoder'].classes_.tolist())
+            
+            self._loaded_path = latest_model
+            self._loaded_mtime = latest_mtime
             
             logger.info(f"Loaded model: {latest_model}")
             logger.info(f"Loaded encoders: {encoder_file}")
@@ -91,74 +130,114 @@ class CareerModelLoader:
         Returns:
             List of predicted roles with probabilities
         """
+        results = self.predict_batch([user_profile])
+        return results[0] if results is not None else None
+    
+    def predict_batch(self, user_profiles: List[Dict]) -> Optional[List[List[Dict]]]:
+        """
+        Make predictions for many profiles with a single model call
+        
+        Args:
+            user_profiles: List of profile dicts, same keys as predict()
+        
+        Returns:
+            One list of predicted roles per profile, in input order
+        """
         if not self.model or not self.encoders:
             logger.warning("Model not loaded. Call load_latest_model() first")
             return None
         
+        if not user_profiles:
+            return []
+        
         try:
-            # Extract encoders
-            role_encoder = self.encoders['role_encoder']
             skill_encoder = self.encoders['skill_encoder']
-            industry_encoder = self.encoders['industry_encoder']
-            
-            # Prepare features
-            current_role = user_profile.get('current_role', 'Unknown')
-            skills = user_profile.get('skills', [])
-            years_exp = user_profile.get('years_of_experience', 0)
-            industry = user_profile.get('industry', 'Unknown')
-            duration = user_profile.get('transition_duration', 24)
-            success = user_profile.get('success_rating', 3)
-            
-            # Encode features
-            try:
-                role_encoded = role_encoder.transform([current_role])[0]
-            except ValueError:
-                logger.warning(f"Unknown role: {current_role}, using default")
-                role_encoded = 0
-            
-            try:
-                industry_encoded = industry_encoder.transform([industry])[0]
-            except ValueError:
-                logger.warning(f"Unknown industry: {industry}, using default")
-                industry_encoded = 0
-            
-            # Encode skills
-            skills_encoded = skill_encoder.transform([skills])[0]
-            
-            # Combine features
-            feature_vector = [
-                role_encoded,
-                years_exp,
-                duration,
-                success,
-                industry_encoded
-            ] + skills_encoded.tolist()
-            
-            # Make prediction
-            feature_array = np.array([feature_vector])
-            
-            # Get probabilities for all classes
-            probabilities = self.model.predict_proba(feature_array)[0]
+            
+            n_profiles = len(user_profiles)
+            roles = [p.get('current_role', 'Unknown') for p in user_profiles]
+            industries = [p.get('industry', 'Unknown') for p in user_profiles]
+            
+            # Encode roles/industries by index lookup; unknown labels fall back to 0
+            role_index = self._role_index
+            industry_index = self._industry_index
+            
+            for role in {r for r in roles if r not in role_index}:
+                self._warn_once(f"role:{role}", f"Unknown role: {role}, using default")
+            for industry in {i for i in industries if i not in industry_index}:
+                self._warn_once(f"industry:{industry}", f"Unknown industry: {industry}, using default")
+            
+            # Same column layout as the trainer: 5 numeric columns, then skills,
+            # filled in place into one float32 buffer
+            feature_array = np.zeros((n_profiles, 5 + len(skill_encoder.classes_)), dtype=np.float32)
+            feature_array[:, 0] = [role_index.get(r, 0) for r in roles]
+            feature_array[:, 1] = [p.get('years_of_experience', 0) for p in user_profiles]
+            feature_array[:, 2] = [p.get('transition_duration', 24) for p in user_profiles]
+            feature_array[:, 3] = [p.get('success_rating', 3) for p in user_profiles]
+            feature_array[:, 4] = [industry_index.get(i, 0) for i in industries]
+            
+            # Drop out-of-vocabulary skills first; transform would otherwise
+            # warn (naming them) on every call
+            skill_vocab = self._skill_vocab
+            skills_encoded = skill_encoder.transform([
+                [skill for skill in p.get('skills', []) if skill in skill_vocab]
+                for p in user_profiles
+            ])
+            if sparse.issparse(skills_encoded):
+                # Scatter the nonzeros rather than densifying a copy first
+                skills_encoded = skills_encoded.tocsr()
+                rows = np.repeat(np.arange(n_profiles), np.diff(skills_encoded.indptr))
+                feature_array[rows, 5 + skills_encoded.indices] = skills_encoded.data
+            else:
+                feature_array[:, 5:] = skills_encoded
+            
+            # Get probabilities for all classes, one row per profile
+            probabilities = self.model.predict_proba(feature_array)
             classes = self.model.classes_
             
-            # Get top predictions
-            top_indices = probabilities.argsort()[-5:][::-1]
+            # Top 5 per row without fully sorting every row
+            k = min(5, probabilities.shape[1])
+            top_indices = np.argpartition(-probabilities, k - 1, axis=1)[:, :k]
+            top_probs = np.take_along_axis(probabilities, top_indices, axis=1)
+            order = np.argsort(-top_probs, axis=1)
+            top_indices = np.take_along_axis(top_indices, order, axis=1)
             
-            predictions = []
-            for idx in top_indices:
-                if probabilities[idx] > 0.05:  # Only include if probability > 5%
-                    predictions.append({
-                        "role": classes[idx],
-                        "probability": float(probabilities[idx]),
-                        "confidence": "high" if probabilities[idx] > 0.5 else "medium" if probabilities[idx] > 0.2 else "low"
-                    })
+            results = []
+            for row, indices in zip(probabilities, top_indices):
+                # Sorted descending, so nothing qualifies if the best doesn't
+                if row[indices[0]] <= 0.05:
+                    results.append([])
+                    continue
+                
+                predictions = []
+                for idx in indices:
+                    if row[idx] > 0.05:  # Only include if probability > 5%
+                        predictions.append({
+                            "role": classes[idx],
+                            "probability": float(row[idx]),
+                            "confidence": "high" if row[idx] > 0.5 else "medium" if row[idx] > 0.2 else "low"
+                        })
+                results.append(predictions)
             
-            return predictions
+            return results
         
         except Exception as e:
             logger.error(f"Error making prediction: {str(e)}")
             return None
     
+    def _warn_once(self, key: str, message: str):
+        """
+        Log a warning at most once per key every _warn_ttl seconds
+        """
+        now = time.monotonic()
+        if now - self._warned.get(key, float('-inf')) <= self._warn_ttl:
+            return
+        
+        # Keep the table bounded under a stream of distinct unknown labels
+        if len(self._warned) > 4096:
+            self._warned.clear()
+        self._warned[key] = now
+        logger.warning(message)
+    
     def is_loaded(self) -> bool:
         """
         Check if model is loaded
@@ -201,8 +280,10 @@ def get_model_loader() -> CareerModelLoader:
 
 def reload_model():
     """
-    Force reload of the model (useful after training)
+    Reload the model (useful after training); a no-op if the latest
+    model on disk is the one already loaded
     """
     global _model_loader
-    _model_loader = CareerModelLoader()
+    if _model_loader is None:
+        _model_loader = CareerModelLoader()
     return _model_loader.load_latest_model()
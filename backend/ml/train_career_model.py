@@ -15,23 +15,40 @@ Requirements:
 import asyncio
 import sys
 import logging
+import logging.handlers
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from database.connection import get_db_pool, close_db_pool
 from ml.career_model_trainer import CareerModelTrainer, train_model_from_cli
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Configure logging; records are buffered and written a section at a time
+# (errors and a full buffer still flush immediately)
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+)
+_log_buffer = logging.handlers.MemoryHandler(
+    capacity=200, flushLevel=logging.ERROR, target=_console_handler
 )
+logging.basicConfig(level=logging.INFO, handlers=[_log_buffer], force=True)
 logger = logging.getLogger(__name__)
 
 
+def _flush_logs():
+    """Write out buffered log records at a section boundary"""
+    _log_buffer.flush()
+
+
 async def check_prerequisites(conn):
     """
     Check if system has sufficient data for training
@@ -41,53 +58,41 @@ async def check_prerequisites(conn):
     logger.info("=" * 70)
     
     async with conn.cursor() as cursor:
-        # Check career_paths table
-        await cursor.execute("""
-            SELECT COUNT(*) FROM career_paths 
-            WHERE from_role IS NOT NULL AND to_role IS NOT NULL
-        """)
-        transitions = (await cursor.fetchone())[0]
-        
-        # Check unique roles
-        await cursor.execute("""
-            SELECT COUNT(DISTINCT from_role) FROM career_paths
-            WHERE from_role IS NOT NULL
-        """)
-        unique_from_roles = (await cursor.fetchone())[0]
-        
-        await cursor.execute("""
-            SELECT COUNT(DISTINCT to_role) FROM career_paths
-            WHERE to_role IS NOT NULL
-        """)
-        unique_to_roles = (await cursor.fetchone())[0]
-        
-        # Check transition matrix
-        await cursor.execute("SELECT COUNT(*) FROM career_transition_matrix")
-        matrix_entries = (await cursor.fetchone())[0]
-        
-        # Check alumni profiles
+        # All counts in one round-trip; COUNT(DISTINCT ...) already skips NULLs
         await cursor.execute("""
-            SELECT COUNT(*) FROM alumni_profiles 
-            WHERE skills IS NOT NULL
+            SELECT
+                (SELECT COUNT(*) FROM career_paths
+                 WHERE from_role IS NOT NULL AND to_role IS NOT NULL),
+                (SELECT COUNT(DISTINCT from_role) FROM career_paths),
+                (SELECT COUNT(DISTINCT to_role) FROM career_paths),
+                (SELECT COUNT(*) FROM career_transition_matrix),
+                (SELECT COUNT(*) FROM alumni_profiles WHERE skills IS NOT NULL)
         """)
-        alumni_with_skills = (await cursor.fetchone())[0]
+        (
+            transitions,
+            unique_from_roles,
+            unique_to_roles,
+            matrix_entries,
+            alumni_with_skills,
+        ) = await cursor.fetchone()
     
     # Display results
     logger.info("")
     logger.info("DATABASE STATUS:")
-    logger.info(f"  Career Transitions: {transitions}")
-    logger.info(f"  Unique Source Roles: {unique_from_roles}")
-    logger.info(f"  Unique Target Roles: {unique_to_roles}")
-    logger.info(f"  Transition Matrix Entries: {matrix_entries}")
-    logger.info(f"  Alumni with Skills: {alumni_with_skills}")
+    logger.info("  Career Transitions: %s", transitions)
+    logger.info("  Unique Source Roles: %s", unique_from_roles)
+    logger.info("  Unique Target Roles: %s", unique_to_roles)
+    logger.info("  Transition Matrix Entries: %s", matrix_entries)
+    logger.info("  Alumni with Skills: %s", alumni_with_skills)
     logger.info("")
+    _flush_logs()
     
     # Check if sufficient data
     if transitions >= 50:
         logger.info("✅ Sufficient data for ML training (≥50 transitions)")
         return True
     else:
-        logger.warning(f"⚠️  Insufficient data. Need {50 - transitions} more transitions")
+        logger.warning("⚠️  Insufficient data. Need %s more transitions", 50 - transitions)
         logger.warning("   Recommendation: Use rule-based predictions until more data is available")
         logger.warning("   You can still try training, but accuracy may be low")
         return False
@@ -107,20 +112,22 @@ async def train_model(conn, min_samples: int = 50):
         
         # Step 1: Calculate transition matrix
         logger.info("Step 1/2: Calculating career transition matrix...")
+        _flush_logs()
         matrix_result = await trainer.calculate_transition_matrix(conn)
         
         if matrix_result.get('success'):
-            logger.info(f"  ✅ Matrix calculated: {matrix_result.get('transitions_calculated')} transitions")
-            logger.info(f"  ✅ Unique roles: {matrix_result.get('unique_from_roles')}")
+            logger.info("  ✅ Matrix calculated: %s transitions", matrix_result.get('transitions_calculated'))
+            logger.info("  ✅ Unique roles: %s", matrix_result.get('unique_from_roles'))
         else:
-            logger.error(f"  ❌ Matrix calculation failed: {matrix_result.get('message')}")
+            logger.error("  ❌ Matrix calculation failed: %s", matrix_result.get('message'))
             return False
         
         logger.info("")
         
         # Step 2: Train ML model
         logger.info("Step 2/2: Training ML model...")
-        logger.info(f"  Minimum samples: {min_samples}")
+        logger.info("  Minimum samples: %s", min_samples)
+        _flush_logs()
         
         training_result = await trainer.train_from_database(conn, min_samples=min_samples)
         
@@ -129,25 +136,25 @@ async def train_model(conn, min_samples: int = 50):
             logger.info("=" * 70)
             logger.info("✅ MODEL TRAINING COMPLETED SUCCESSFULLY")
             logger.info("=" * 70)
-            logger.info(f"  Model Path: {training_result.get('model_path')}")
-            logger.info(f"  Training Samples: {training_result.get('training_samples')}")
-            logger.info(f"  Test Samples: {training_result.get('test_samples')}")
+            logger.info("  Model Path: %s", training_result.get('model_path'))
+            logger.info("  Training Samples: %s", training_result.get('training_samples'))
+            logger.info("  Test Samples: %s", training_result.get('test_samples'))
             logger.info("")
             
             metrics = training_result.get('metrics', {})
             logger.info("  Performance Metrics:")
-            logger.info(f"    Accuracy:  {metrics.get('accuracy', 0):.3f}")
-            logger.info(f"    Precision: {metrics.get('precision', 0):.3f}")
-            logger.info(f"    Recall:    {metrics.get('recall', 0):.3f}")
-            logger.info(f"    F1-Score:  {metrics.get('f1_score', 0):.3f}")
+            logger.info("    Accuracy:  %.3f", metrics.get('accuracy', 0))
+            logger.info("    Precision: %.3f", metrics.get('precision', 0))
+            logger.info("    Recall:    %.3f", metrics.get('recall', 0))
+            logger.info("    F1-Score:  %.3f", metrics.get('f1_score', 0))
             logger.info("")
             
             logger.info("  Top Important Features:")
             for feat in metrics.get('top_features', [])[:5]:
-                logger.info(f"    {feat['feature']}: {feat['importance']:.4f}")
+                logger.info("    %s: %.4f", feat['feature'], feat['importance'])
             
             logger.info("")
-            logger.info(f"  Trained at: {training_result.get('trained_at')}")
+            logger.info("  Trained at: %s", training_result.get('trained_at'))
             logger.info("=" * 70)
             return True
         else:
@@ -155,9 +162,9 @@ async def train_model(conn, min_samples: int = 50):
             logger.error("=" * 70)
             logger.error("❌ MODEL TRAINING FAILED")
             logger.error("=" * 70)
-            logger.error(f"  Reason: {training_result.get('message')}")
-            logger.error(f"  Current Samples: {training_result.get('current_samples', 0)}")
-            logger.error(f"  Required Samples: {min_samples}")
+            logger.error("  Reason: %s", training_result.get('message'))
+            logger.error("  Current Samples: %s", training_result.get('current_samples', 0))
+            logger.error("  Required Samples: %s", min_samples)
             logger.error("")
             logger.error("  Suggestions:")
             logger.error("    1. Add more career path data to the database")
@@ -171,7 +178,7 @@ async def train_model(conn, min_samples: int = 50):
         logger.error("=" * 70)
         logger.error("❌ TRAINING ERROR")
         logger.error("=" * 70)
-        logger.error(f"  Error: {str(e)}")
+        logger.error("  Error: %s", e)
         logger.error("")
         logger.error("  Common causes:")
         logger.error("    1. Database connection issues")
@@ -192,7 +199,7 @@ async def main():
     logger.info("=" * 70)
     logger.info("CAREER PATH ML MODEL TRAINING")
     logger.info("=" * 70)
-    logger.info(f"Started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info("Started at: %s", start_time.strftime('%Y-%m-%d %H:%M:%S'))
     logger.info("=" * 70)
     logger.info("")
     
@@ -202,56 +209,61 @@ async def main():
     try:
         # Get database connection
         logger.info("Connecting to database...")
+        _flush_logs()
         pool = await get_db_pool()
         logger.info("✅ Database connected")
         logger.info("")
         
+        # Check prerequisites, then release the connection so it isn't held
+        # while waiting on the prompt below
         async with pool.acquire() as conn:
-            # Check prerequisites
             has_sufficient_data = await check_prerequisites(conn)
+        logger.info("")
+        
+        # Ask for confirmation if insufficient data
+        if not has_sufficient_data:
+            logger.info("")
+            logger.info("=" * 70)
+            logger.info("RECOMMENDATION")
+            logger.info("=" * 70)
+            logger.info("The rule-based career prediction system is currently active and")
+            logger.info("working well. ML training requires at least 50 career transitions")
+            logger.info("for accurate predictions.")
+            logger.info("")
+            logger.info("Options:")
+            logger.info("  1. Continue using rule-based predictions (recommended)")
+            logger.info("  2. Collect more career data via admin dashboard")
+            logger.info("  3. Load sample data: mysql < /app/sample_data_insert.sql")
+            logger.info("  4. Proceed with training anyway (low accuracy expected)")
+            logger.info("=" * 70)
             logger.info("")
+            _flush_logs()
             
-            # Ask for confirmation if insufficient data
-            if not has_sufficient_data:
+            response = await asyncio.to_thread(input, "Proceed with training anyway? (yes/no): ")
+            response = response.lower().strip()
+            if response not in ['yes', 'y']:
                 logger.info("")
                 logger.info("=" * 70)
-                logger.info("RECOMMENDATION")
+                logger.info("Training cancelled - Rule-based system continues to work")
                 logger.info("=" * 70)
-                logger.info("The rule-based career prediction system is currently active and")
-                logger.info("working well. ML training requires at least 50 career transitions")
-                logger.info("for accurate predictions.")
                 logger.info("")
-                logger.info("Options:")
-                logger.info("  1. Continue using rule-based predictions (recommended)")
-                logger.info("  2. Collect more career data via admin dashboard")
-                logger.info("  3. Load sample data: mysql < /app/sample_data_insert.sql")
-                logger.info("  4. Proceed with training anyway (low accuracy expected)")
+                logger.info("Next steps:")
+                logger.info("  1. Collect career transition data via admin panel")
+                logger.info("  2. Run this script again when you have 50+ transitions")
+                logger.info("  3. See: /app/ADMIN_CAREER_DATA_COLLECTION.md")
                 logger.info("=" * 70)
-                logger.info("")
-                
-                response = input("Proceed with training anyway? (yes/no): ").lower().strip()
-                if response not in ['yes', 'y']:
-                    logger.info("")
-                    logger.info("=" * 70)
-                    logger.info("Training cancelled - Rule-based system continues to work")
-                    logger.info("=" * 70)
-                    logger.info("")
-                    logger.info("Next steps:")
-                    logger.info("  1. Collect career transition data via admin panel")
-                    logger.info("  2. Run this script again when you have 50+ transitions")
-                    logger.info("  3. See: /app/ADMIN_CAREER_DATA_COLLECTION.md")
-                    logger.info("=" * 70)
-                    return
-                logger.info("")
-            
-            # Train model
+                return
+            logger.info("")
+        
+        # Train model
+        async with pool.acquire() as conn:
             success = await train_model(conn, min_samples=50)
     
     except KeyboardInterrupt:
         logger.info("\n\nTraining interrupted by user (Ctrl+C)")
     
     except Exception as e:
-        logger.error(f"\n\n❌ Fatal error: {str(e)}")
+        logger.error("\n\n❌ Fatal error: %s", e)
         import traceback
         traceback.print_exc()
     
@@ -262,7 +274,7 @@ async def main():
                 await close_db_pool()
                 logger.info("\n✅ Database connection closed")
             except Exception as e:
-                logger.error(f"\n⚠️  Error closing database: {str(e)}")
+                logger.error("\n⚠️  Error closing database: %s", e)
         
         # Print summary
         end_time = datetime.now()
@@ -272,20 +284,25 @@ async def main():
         logger.info("=" * 70)
         logger.info("TRAINING SUMMARY")
         logger.info("=" * 70)
-        logger.info(f"  Status: {'✅ SUCCESS' if success else '❌ FAILED'}")
-        logger.info(f"  Duration: {duration}")
-        logger.info(f"  Ended at: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info("  Status: %s", '✅ SUCCESS' if success else '❌ FAILED')
+        logger.info("  Duration: %s", duration)
+        logger.info("  Ended at: %s", end_time.strftime('%Y-%m-%d %H:%M:%S'))
         logger.info("=" * 70)
         logger.info("")
+        _flush_logs()
         
         # Exit with appropriate code
         sys.exit(0 if success else 1)
 
 
 if __name__ == "__main__":
+    # libuv-based loop where available (not on Windows); stdlib loop otherwise
+    if UVLOOP_AVAILABLE:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     # Run the training
     try:
         asyncio.run(main())
     except Exception as e:
-        logger.error(f"Failed to start training: {str(e)}")
+        logger.error("Failed to start training: %s", e)
         sys.exit(1)
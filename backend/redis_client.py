@@ -3,16 +3,19 @@ Redis Client Configuration
 Caching and real-time data management for AlumUnity
 """
 import redis.asyncio as aioredis
-import json
+import asyncio
+import orjson
+import hashlib
 import os
-from typing import Optional, Any
+from typing import Optional, Any, Callable, Dict, List
 import logging
 from datetime import timedelta
 
 logger = logging.getLogger(__name__)
 
-# Global Redis client instance
+# Global Redis client instance and the connection pool it is pinned to
 redis_client: Optional[aioredis.Redis] = None
+redis_pool: Optional[aioredis.ConnectionPool] = None
 
 
 class RedisConfig:
@@ -23,6 +26,8 @@ class RedisConfig:
     PORT = int(os.getenv('REDIS_PORT', 6379))
     DB = int(os.getenv('REDIS_DB', 0))
     PASSWORD = os.getenv('REDIS_PASSWORD', None)
+    MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONN', 50))
+    HEALTH_CHECK_INTERVAL = 30  # seconds idle before a connection is re-checked
     
     # TTL Settings (in seconds)
     TTL_SESSION = 86400  # 24 hours
@@ -31,6 +36,7 @@ class RedisConfig:
     TTL_API_CACHE_LONG = 1800  # 30 minutes
     TTL_AI_PREDICTIONS = 86400  # 24 hours
     TTL_SKILL_EMBEDDINGS = 604800  # 7 days
+    TTL_LEADERBOARD_TOP = 10  # 10 seconds
     
     # Key Prefixes
     PREFIX_SESSION = 'session'
@@ -41,37 +47,46 @@ class RedisConfig:
     PREFIX_QUEUE = 'queue'
     PREFIX_NOTIFICATION = 'notification'
     PREFIX_LEADERBOARD = 'leaderboard'
+    PREFIX_LEADERBOARD_TOP = 'leaderboard_top'
 
 
 async def get_redis_client() -> aioredis.Redis:
     """Get or create Redis client"""
-    global redis_client
+    global redis_client, redis_pool
     if redis_client is None:
         try:
+            # Pooled connections are kept alive and health-checked so TLS
+            # handshakes (e.g. Upstash) are not repeated on every refill.
+            # Replies stay bytes (no decode_responses); _loads decodes them
+            pool_options = {
+                "max_connections": RedisConfig.MAX_CONNECTIONS,
+                "socket_keepalive": True,
+                "health_check_interval": RedisConfig.HEALTH_CHECK_INTERVAL,
+                "retry_on_timeout": True,
+            }
+            
             # Check if REDIS_URL is provided (for cloud services like Upstash)
             redis_url = os.getenv('REDIS_URL')
             
             if redis_url:
                 # Use the full Redis URL (supports rediss:// for TLS)
-                redis_client = await aioredis.from_url(
+                redis_pool = aioredis.ConnectionPool.from_url(
                     redis_url,
-                    encoding="utf-8",
-                    decode_responses=True,
-                    max_connections=10,
-                    ssl_cert_reqs=None  # Required for some cloud Redis providers
+                    ssl_cert_reqs=None,  # Required for some cloud Redis providers
+                    **pool_options
                 )
                 logger.info(f"✅ Connecting to Redis using URL: {redis_url.split('@')[1] if '@' in redis_url else redis_url}")
             else:
                 # Fallback to individual connection parameters
-                redis_client = await aioredis.from_url(
+                redis_pool = aioredis.ConnectionPool.from_url(
                     f"redis://{RedisConfig.HOST}:{RedisConfig.PORT}/{RedisConfig.DB}",
                     password=RedisConfig.PASSWORD,
-                    encoding="utf-8",
-                    decode_responses=True,
-                    max_connections=10
+                    **pool_options
                 )
                 logger.info(f"✅ Connecting to Redis at {RedisConfig.HOST}:{RedisConfig.PORT}")
             
+            redis_client = aioredis.Redis(connection_pool=redis_pool)
+            
             # Test connection
             await redis_client.ping()
             logger.info("✅ Redis connection established successfully")
@@ -82,21 +97,37 @@ async def get_redis_client() -> aioredis.Redis:
 
 
 async def close_redis_client():
-    """Close Redis connection"""
-    global redis_client
+    """Close Redis connection and disconnect its pool"""
+    global redis_client, redis_pool
     if redis_client:
         await redis_client.close()
         redis_client = None
+    if redis_pool:
+        await redis_pool.disconnect()
+        redis_pool = None
         logger.info("Redis connection closed")
 
 
+# The helpers below read the module-level redis_client directly once it is
+# connected (at app startup) and only fall back to get_redis_client() before that
 class RedisCache:
     """Redis caching utilities"""
     
     @staticmethod
-    def _make_key(prefix: str, identifier: str) -> str:
-        """Create a namespaced Redis key"""
-        return f"{prefix}:{identifier}"
+    def _dumps(value: Any) -> Any:
+        """Serialize a value for storage (strings are stored as-is)"""
+        if isinstance(value, (str, bytes)):
+            return value
+        # OPT_NON_STR_KEYS keeps json.dumps' handling of int/etc. dict keys
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    
+    @staticmethod
+    def _loads(value: bytes) -> Any:
+        """Deserialize stored bytes; values that aren't JSON come back as str"""
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            return value.decode() if isinstance(value, bytes) else value
     
     @staticmethod
     async def set(
@@ -107,12 +138,11 @@ class RedisCache:
     ) -> bool:
         """Set a value in Redis with optional TTL"""
         try:
-            client = await get_redis_client()
-            full_key = RedisCache._make_key(prefix, key) if prefix else key
+            client = redis_client if redis_client is not None else await get_redis_client()
+            full_key = prefix + ":" + key if prefix else key
             
             # Serialize value to JSON if not string
-            if not isinstance(value, str):
-                value = json.dumps(value)
+            value = RedisCache._dumps(value)
             
             if ttl:
                 await client.setex(full_key, ttl, value)
@@ -128,8 +158,8 @@ class RedisCache:
     async def get(key: str, prefix: str = "") -> Optional[Any]:
         """Get a value from Redis"""
         try:
-            client = await get_redis_client()
-            full_key = RedisCache._make_key(prefix, key) if prefix else key
+            client = redis_client if redis_client is not None else await get_redis_client()
+            full_key = prefix + ":" + key if prefix else key
             
             value = await client.get(full_key)
             
@@ -137,33 +167,98 @@ class RedisCache:
                 return None
             
             # Try to deserialize JSON
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value
+            return RedisCache._loads(value)
         except Exception as e:
             logger.error(f"Redis GET error: {str(e)}")
             return None
     
+    @staticmethod
+    async def mget(keys: List[str], prefix: str = "") -> List[Optional[Any]]:
+        """Get many values from Redis in one round-trip (None for misses)"""
+        if not keys:
+            return []
+        try:
+            client = redis_client if redis_client is not None else await get_redis_client()
+            full_keys = [prefix + ":" + key if prefix else key for key in keys]
+            
+            values = await client.mget(full_keys)
+            
+            return [None if value is None else RedisCache._loads(value) for value in values]
+        except Exception as e:
+            logger.error(f"Redis MGET error: {str(e)}")
+            return [None] * len(keys)
+    
+    @staticmethod
+    async def mset(
+        mapping: Dict[str, Any],
+        ttl: Optional[int] = None,
+        prefix: str = ""
+    ) -> bool:
+        """Set many values (with optional TTL) in one pipelined round-trip"""
+        if not mapping:
+            return True
+        try:
+            client = redis_client if redis_client is not None else await get_redis_client()
+            
+            async with client.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    full_key = prefix + ":" + key if prefix else key
+                    if ttl:
+                        pipe.setex(full_key, ttl, RedisCache._dumps(value))
+                    else:
+                        pipe.set(full_key, RedisCache._dumps(value))
+                await pipe.execute()
+            
+            return True
+        except Exception as e:
+            logger.error(f"Redis MSET error: {str(e)}")
+            return False
+    
     @staticmethod
     async def delete(key: str, prefix: str = "") -> bool:
         """Delete a key from Redis"""
         try:
-            client = await get_redis_client()
-            full_key = RedisCache._make_key(prefix, key) if prefix else key
+            client = redis_client if redis_client is not None else await get_redis_client()
+            full_key = prefix + ":" + key if prefix else key
             await client.delete(full_key)
             return True
         except Exception as e:
             logger.error(f"Redis DELETE error: {str(e)}")
             return False
     
+    @staticmethod
+    async def delete_many(keys: List[str], prefix: str = "") -> int:
+        """Delete several keys in one round-trip, returning how many existed"""
+        if not keys:
+            return 0
+        try:
+            client = redis_client if redis_client is not None else await get_redis_client()
+            full_keys = [prefix + ":" + key if prefix else key for key in keys]
+            return await client.delete(*full_keys)
+        except Exception as e:
+            logger.error(f"Redis DELETE_MANY error: {str(e)}")
+            return 0
+    
+    @staticmethod
+    async def delete_pattern(pattern: str) -> int:
+        """Delete every key matching a glob pattern (SCAN + one pipelined DEL)"""
+        try:
+            client = redis_client if redis_client is not None else await get_redis_client()
+            async with client.pipeline(transaction=False) as pipe:
+                async for key in client.scan_iter(match=pattern, count=500):
+                    pipe.delete(key)
+                return sum(await pipe.execute())
+        except Exception as e:
+            logger.error(f"Redis DELETE_PATTERN error: {str(e)}")
+            return 0
+    
     @staticmethod
     async def exists(key: str, prefix: str = "") -> bool:
         """Check if key exists in Redis"""
         try:
-            client = await get_redis_client()
-            full_key = RedisCache._make_key(prefix, key) if prefix else key
-            return await client.exists(full_key) > 0
+            client = redis_client if redis_client is not None else await get_redis_client()
+            full_key = prefix + ":" + key if prefix else key
+            return bool(await client.exists(full_key))
         except Exception as e:
             logger.error(f"Redis EXISTS error: {str(e)}")
             return False
@@ -172,8 +267,8 @@ class RedisCache:
     async def increment(key: str, prefix: str = "", amount: int = 1) -> Optional[int]:
         """Increment a counter in Redis"""
         try:
-            client = await get_redis_client()
-            full_key = RedisCache._make_key(prefix, key) if prefix else key
+            client = redis_client if redis_client is not None else await get_redis_client()
+            full_key = prefix + ":" + key if prefix else key
             return await client.incrby(full_key, amount)
         except Exception as e:
             logger.error(f"Redis INCREMENT error: {str(e)}")
@@ -200,10 +295,30 @@ class RedisLeaderboard:
         score: float
     ) -> bool:
         """Add or update a member's score in leaderboard"""
+        return await RedisLeaderboard.add_scores(leaderboard_name, {member: score})
+    
+    @staticmethod
+    async def add_scores(
+        leaderboard_name: str,
+        mapping: Dict[str, float],
+        only_greater: bool = False
+    ) -> bool:
+        """
+        Add or update many members' scores with a single ZADD
+        
+        With only_greater, existing members are only updated when the new
+        score is higher (ZADD GT); new members are always added.
+        """
+        if not mapping:
+            return True
         try:
-            client = await get_redis_client()
-            key = RedisCache._make_key(RedisConfig.PREFIX_LEADERBOARD, leaderboard_name)
-            await client.zadd(key, {member: score})
+            client = redis_client if redis_client is not None else await get_redis_client()
+            key = RedisConfig.PREFIX_LEADERBOARD + ":" + leaderboard_name
+            # Drop the cached top-N results in the same round-trip
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.zadd(key, mapping, gt=only_greater)
+                pipe.delete(RedisConfig.PREFIX_LEADERBOARD_TOP + ":" + leaderboard_name)
+                await pipe.execute()
             return True
         except Exception as e:
             logger.error(f"Leaderboard ADD error: {str(e)}")
@@ -213,14 +328,27 @@ class RedisLeaderboard:
     async def get_top(leaderboard_name: str, limit: int = 10) -> list:
         """Get top N members from leaderboard"""
         try:
-            client = await get_redis_client()
-            key = RedisCache._make_key(RedisConfig.PREFIX_LEADERBOARD, leaderboard_name)
+            client = redis_client if redis_client is not None else await get_redis_client()
+            # Encoded results are kept briefly in a hash keyed by limit, which
+            # add_scores deletes whenever the leaderboard changes
+            top_key = RedisConfig.PREFIX_LEADERBOARD_TOP + ":" + leaderboard_name
+            cached = await client.hget(top_key, limit)
+            if cached is not None:
+                return orjson.loads(cached)
+            
+            key = RedisConfig.PREFIX_LEADERBOARD + ":" + leaderboard_name
             # Get top scores in descending order
             results = await client.zrevrange(key, 0, limit - 1, withscores=True)
-            return [
-                {"member": member, "score": score}
+            top = [
+                {"member": member.decode(), "score": score}
                 for member, score in results
             ]
+            
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.hset(top_key, limit, orjson.dumps(top))
+                pipe.expire(top_key, RedisConfig.TTL_LEADERBOARD_TOP)
+                await pipe.execute()
+            return top
         except Exception as e:
             logger.error(f"Leaderboard GET_TOP error: {str(e)}")
             return []
@@ -229,8 +357,8 @@ class RedisLeaderboard:
     async def get_rank(leaderboard_name: str, member: str) -> Optional[int]:
         """Get member's rank in leaderboard (1-based)"""
         try:
-            client = await get_redis_client()
-            key = RedisCache._make_key(RedisConfig.PREFIX_LEADERBOARD, leaderboard_name)
+            client = redis_client if redis_client is not None else await get_redis_client()
+            key = RedisConfig.PREFIX_LEADERBOARD + ":" + leaderboard_name
             rank = await client.zrevrank(key, member)
             return rank + 1 if rank is not None else None
         except Exception as e:
@@ -245,13 +373,10 @@ class RedisQueue:
     async def push(queue_name: str, item: Any) -> bool:
         """Push item to queue (FIFO)"""
         try:
-            client = await get_redis_client()
-            key = RedisCache._make_key(RedisConfig.PREFIX_QUEUE, queue_name)
+            client = redis_client if redis_client is not None else await get_redis_client()
+            key = RedisConfig.PREFIX_QUEUE + ":" + queue_name
             
-            if not isinstance(item, str):
-                item = json.dumps(item)
-            
-            await client.rpush(key, item)
+            await client.rpush(key, RedisCache._dumps(item))
             return True
         except Exception as e:
             logger.error(f"Queue PUSH error: {str(e)}")
@@ -261,18 +386,15 @@ class RedisQueue:
     async def pop(queue_name: str) -> Optional[Any]:
         """Pop item from queue (FIFO)"""
         try:
-            client = await get_redis_client()
-            key = RedisCache._make_key(RedisConfig.PREFIX_QUEUE, queue_name)
+            client = redis_client if redis_client is not None else await get_redis_client()
+            key = RedisConfig.PREFIX_QUEUE + ":" + queue_name
             
             value = await client.lpop(key)
             
             if value is None:
                 return None
             
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value
+            return RedisCache._loads(value)
         except Exception as e:
             logger.error(f"Queue POP error: {str(e)}")
             return None
@@ -281,21 +403,47 @@ class RedisQueue:
     async def length(queue_name: str) -> int:
         """Get queue length"""
         try:
-            client = await get_redis_client()
-            key = RedisCache._make_key(RedisConfig.PREFIX_QUEUE, queue_name)
+            client = redis_client if redis_client is not None else await get_redis_client()
+            key = RedisConfig.PREFIX_QUEUE + ":" + queue_name
             return await client.llen(key)
         except Exception as e:
             logger.error(f"Queue LENGTH error: {str(e)}")
             return 0
 
 
+# Cache misses currently being computed by cache_response, keyed by the
+# full cache key, so concurrent callers share one call instead of stampeding
+_inflight: Dict[str, asyncio.Future] = {}
+
+
 # API Response Caching Decorator
-def cache_response(ttl: int = RedisConfig.TTL_API_CACHE_MEDIUM, prefix: str = "api:cache"):
-    """Decorator to cache API responses"""
+def cache_response(
+    ttl: int = RedisConfig.TTL_API_CACHE_MEDIUM,
+    prefix: str = "api:cache",
+    key_builder: Optional[Callable[..., str]] = None
+):
+    """
+    Decorator to cache API responses
+    
+    key_builder(*args, **kwargs) may return the cache key instead of the
+    default name+arguments key, so callers can look entries up (e.g. with
+    RedisCache.mget) without calling the function.
+    """
     def decorator(func):
+        key_head = func.__name__ + ":"
+        
         async def wrapper(*args, **kwargs):
-            # Generate cache key from function name and arguments
-            cache_key = f"{func.__name__}:{str(args)}:{str(kwargs)}"
+            # Generate cache key from function name and a hash of the
+            # arguments (kwargs sorted so call order doesn't matter)
+            if key_builder is not None:
+                cache_key = key_builder(*args, **kwargs)
+            else:
+                payload = orjson.dumps(
+                    (args, sorted(kwargs.items())),
+                    default=str,
+                    option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+                )
+                cache_key = key_head + hashlib.blake2b(payload, digest_size=8).hexdigest()
             
             # Try to get from cache
             cached = await RedisCache.get(cache_key, prefix=prefix)
@@ -303,10 +451,39 @@ def cache_response(ttl: int = RedisConfig.TTL_API_CACHE_MEDIUM, prefix: str = "a
                 logger.debug(f"Cache HIT: {cache_key}")
                 return cached
             
-            # Execute function and cache result
-            result = await func(*args, **kwargs)
-            await RedisCache.set(cache_key, result, ttl=ttl, prefix=prefix)
-            logger.debug(f"Cache MISS: {cache_key}")
+            # Another request is already computing this entry: wait for it
+            # (shielded so one waiter cancelling doesn't cancel the others)
+            full_key = prefix + ":" + cache_key if prefix else cache_key
+            while (pending := _inflight.get(full_key)) is not None:
+                logger.debug(f"Cache WAIT: {cache_key}")
+                try:
+                    return await asyncio.shield(pending)
+                except asyncio.CancelledError:
+                    # Only our own cancellation propagates; if the computing
+                    # request was cancelled (e.g. its client went away), try
+                    # again, computing the entry ourselves if nobody else is
+                    if not pending.cancelled():
+                        raise
+            
+            future = asyncio.get_running_loop().create_future()
+            _inflight[full_key] = future
+            try:
+                # Execute function and cache result
+                result = await func(*args, **kwargs)
+                future.set_result(result)
+                await RedisCache.set(cache_key, result, ttl=ttl, prefix=prefix)
+                logger.debug(f"Cache MISS: {cache_key}")
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark it retrieved so an unawaited future doesn't warn
+                    future.exception()
+                raise
+            finally:
+                _inflight.pop(full_key, None)
             
             return result
         return wrapper
@@ -1,22 +1,49 @@
 """Admin routes for profile verification and management"""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse
 from typing import Optional
 
 from database.models import (
     VerifyProfileRequest,
     RejectProfileRequest,
-    UserResponse
+    UserResponse,
+    AdminActionResponse,
+    AdminDataResponse
 )
 from services.admin_service import AdminService
 from middleware.auth_middleware import require_admin
+from middleware.etag import etag_json_response
+from redis_client import RedisCache
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/admin", tags=["admin"])
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["admin"],
+    default_response_class=ORJSONResponse
+)
+
+# Verification lists also change whenever a profile is created or edited,
+# so their cached bodies only live a few seconds; that still absorbs polling
+# bursts and keeps the ETag/304 path cheap
+VERIFICATION_CACHE_TTL = 5
+
+# Cached verification list responses that go stale when a profile is
+# verified or rejected
+VERIFICATION_CACHE_PATTERNS = (
+    "api:cache:get_pending_verifications:*",
+    "api:cache:get_verification_requests:*",
+)
+
 
+async def _invalidate_verification_caches():
+    """Drop cached verification lists after an admin decision"""
+    for pattern in VERIFICATION_CACHE_PATTERNS:
+        await RedisCache.delete_pattern(pattern)
 
-@router.post("/profiles/verify/{user_id}", response_model=dict)
+
+@router.post("/profiles/verify/{user_id}", response_model=AdminActionResponse)
 async def verify_profile(
     user_id: str,
     current_user: dict = Depends(require_admin)
@@ -30,6 +57,7 @@ async def verify_profile(
     """
     try:
         result = await AdminService.verify_profile(user_id, current_user["id"])
+        await _invalidate_verification_caches()
         
         return {
             "success": True,
@@ -49,7 +77,7 @@ async def verify_profile(
         )
 
 
-@router.post("/profiles/reject/{user_id}", response_model=dict)
+@router.post("/profiles/reject/{user_id}", response_model=AdminActionResponse)
 async def reject_profile(
     user_id: str,
     rejection_data: RejectProfileRequest,
@@ -67,6 +95,7 @@ async def reject_profile(
             current_user["id"],
             rejection_data.rejection_reason
         )
+        await _invalidate_verification_caches()
         
         return {
             "success": True,
@@ -89,8 +118,9 @@ async def reject_profile(
         )
 
 
-@router.get("/profiles/pending", response_model=dict)
+@router.get("/profiles/pending", response_model=AdminDataResponse)
 async def get_pending_verifications(
+    request: Request,
     page: int = 1,
     limit: int = 20,
     current_user: dict = Depends(require_admin)
@@ -104,12 +134,21 @@ async def get_pending_verifications(
     - Don't have a rejection record
     """
     try:
-        result = await AdminService.get_pending_verifications(page, limit)
+        async def build_payload():
+            result = await AdminService.get_pending_verifications(page, limit)
+            return {
+                "success": True,
+                "data": result
+            }
         
-        return {
-            "success": True,
-            "data": result
-        }
+        # Served with an ETag; cached briefly, or until a verify/reject
+        # invalidates it
+        return await etag_json_response(
+            request,
+            f"get_pending_verifications:{page}:{limit}",
+            build_payload,
+            ttl=VERIFICATION_CACHE_TTL
+        )
     except Exception as e:
         logger.error(f"Error fetching pending verifications: {e}")
         raise HTTPException(
@@ -118,9 +157,10 @@ async def get_pending_verifications(
         )
 
 
-@router.get("/profiles/verification-requests", response_model=dict)
+@router.get("/profiles/verification-requests", response_model=AdminDataResponse)
 async def get_verification_requests(
-    status: Optional[str] = None,
+    request: Request,
+    status_filter: Optional[str] = Query(None, alias="status"),
     page: int = 1,
     limit: int = 20,
     current_user: dict = Depends(require_admin)
@@ -134,23 +174,36 @@ async def get_verification_requests(
     """
     try:
         # Validate status if provided
-        if status and status not in ['pending', 'approved', 'rejected']:
+        if status_filter and status_filter not in ['pending', 'approved', 'rejected']:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid status. Must be: pending, approved, or rejected"
             )
         
-        result = await AdminService.get_all_verification_requests(status, page, limit)
+        async def build_payload():
+            result = await AdminService.get_all_verification_requests(status_filter, page, limit)
+            return {
+                "success": True,
+                "data": result
+            }
         
-        return {
-            "success": True,
-            "data": result
-        }
+        return await etag_json_response(
+            request,
+            f"get_verification_requests:{status_filter or 'all'}:{page}:{limit}",
+            build_payload,
+            ttl=VERIFICATION_CACHE_TTL
+        )
     except HTTPException:
         raise
+    except Exception as e:
+        logger.error(f"Error fetching verification requests: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch verification requests"
+        )
 
 
-@router.post("/profiles/create-missing", response_model=dict)
+@router.post("/profiles/create-missing", response_model=AdminActionResponse)
 async def create_missing_alumni_profiles(
     current_user: dict = Depends(require_admin)
 ):
@@ -174,15 +227,9 @@ async def create_missing_alumni_profiles(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create missing profiles"
         )
-    except Exception as e:
-        logger.error(f"Error fetching verification requests: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch verification requests"
-        )
 
 
-@router.get("/profiles/verification-status/{user_id}", response_model=dict)
+@router.get("/profiles/verification-status/{user_id}", response_model=AdminDataResponse)
 async def get_user_verification_status(
     user_id: str,
     current_user: dict = Depends(require_admin)
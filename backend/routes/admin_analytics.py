@@ -1,21 +1,203 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from typing import Optional
+from collections import Counter
+from itertools import chain
+import asyncio
+import functools
 import logging
-from database.connection import get_sync_db_connection
+import time
+import aiomysql
+import orjson
+from database.connection import acquire_for_read, get_db_pool
 from middleware.auth_middleware import require_admin
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/admin/analytics", tags=["admin-analytics"])
+router = APIRouter(
+    prefix="/api/admin/analytics",
+    tags=["admin-analytics"],
+    default_response_class=ORJSONResponse
+)
 
-@router.get("/dashboard", dependencies=[Depends(require_admin)])
-async def get_dashboard_stats():
-    """Get overall dashboard statistics"""
+# Seconds an aggregate is served from memory before it is recomputed
+ANALYTICS_CACHE_TTL = 120
+
+
+# MySQL error codes that mean a rollup table isn't installed (ER_NO_SUCH_TABLE)
+MISSING_TABLE_ERRORS = {1146}
+
+# ... or that the server can't run JSON_TABLE (ER_PARSE_ERROR, ER_SYNTAX_ERROR,
+# ER_SP_DOES_NOT_EXIST)
+UNSUPPORTED_SQL_ERRORS = {1064, 1149, 1305}
+
+# Fallbacks already reported by this process
+_reported_fallbacks = set()
+
+
+def _fall_back_or_raise(error, codes, source):
+    """
+    Re-raise error unless its code is one of codes; otherwise log, once per
+    process for each source, that the slower fallback is being used
+    """
+    if error.args[0] not in codes:
+        raise error
+    if source not in _reported_fallbacks:
+        _reported_fallbacks.add(source)
+        logger.warning(f"{source} unavailable, falling back to live aggregation: {error}")
+
+
+def _ttl_cache(ttl=ANALYTICS_CACHE_TTL):
+    """
+    Cache a handler's response in process for ttl seconds, keyed on its
+    query parameters. Results are the same for every admin, so the caller
+    is not part of the key; failures raise and are never cached.
+    """
+    def decorator(func):
+        entries = {}
+        
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            key = tuple(sorted(kwargs.items()))
+            entry = entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            
+            result = await func(**kwargs)
+            entries[key] = (time.monotonic() + ttl, result)
+            return result
+        
+        return wrapper
+    return decorator
+
+
+async def _top_json_array_values(cursor, table, column, limit):
+    """
+    Return [(value, count), ...] for the most common elements of a JSON array
+    column, counted in MySQL with JSON_TABLE so only the top rows come back.
+    Servers without JSON_TABLE (MySQL < 8.0.4, MariaDB < 10.6) fall back to
+    counting in Python.
+    """
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
+        await cursor.execute(f"""
+            SELECT jt.value, COUNT(*) as count
+            FROM {table},
+                 JSON_TABLE({column}, '$[*]' COLUMNS (value VARCHAR(255) PATH '$')) jt
+            WHERE {column} IS NOT NULL AND jt.value IS NOT NULL
+            GROUP BY jt.value
+            ORDER BY count DESC
+            LIMIT %s
+        """, (limit,))
+        return [(row['value'], row['count']) for row in await cursor.fetchall()]
+    except (aiomysql.ProgrammingError, aiomysql.OperationalError) as e:
+        _fall_back_or_raise(e, UNSUPPORTED_SQL_ERRORS, "JSON_TABLE")
+    
+    await cursor.execute(f"""
+        SELECT {column}
+        FROM {table}
+        WHERE {column} IS NOT NULL
+    """)
+    rows = await cursor.fetchall()
+    
+    return Counter(chain.from_iterable(_json_arrays(rows, column))).most_common(limit)
+
+
+def _json_arrays(rows, column):
+    """Yield each row's decoded JSON array, skipping malformed or non-array values"""
+    for row in rows:
+        value = row[column]
+        try:
+            values = orjson.loads(value) if isinstance(value, (str, bytes)) else value
+        except (ValueError, TypeError):
+            continue
+        if isinstance(values, list):
+            yield values
+
+
+# Rollup rows older than this are treated as missing, so a stopped event
+# scheduler falls back to live aggregation instead of serving frozen counts
+ROLLUP_MAX_AGE_MINUTES = 15
+
+# Single-row snapshot refreshed every few minutes by the refresh_dashboard_stats
+# event (database_admin_analytics_rollups.sql), aliased to the response keys
+DASHBOARD_STATS_QUERY = f"""
+    SELECT 
+        total_users as totalUsers,
+        active_users as activeUsers,
+        total_students as totalStudents,
+        total_alumni as totalAlumni,
+        total_recruiters as totalRecruiters,
+        verified_alumni as verifiedAlumni,
+        total_jobs as totalJobs,
+        active_jobs as activeJobs,
+        total_events as totalEvents,
+        published_events as publishedEvents,
+        forum_posts as forumPosts
+    FROM dashboard_stats
+    WHERE id = 1 AND refreshed_at >= NOW() - INTERVAL {ROLLUP_MAX_AGE_MINUTES} MINUTE
+"""
+
+
+# Active-user counts refreshed every minute by the refresh_engagement_rollups
+# event, aliased to the live query's keys
+ENGAGEMENT_ROLLUP_QUERY = f"""
+    SELECT 
+        daily_active as dailyActive,
+        weekly_active as weeklyActive,
+        monthly_active as monthlyActive,
+        total_users as totalUsers
+    FROM engagement_rollup
+    WHERE id = 1 AND refreshed_at >= NOW() - INTERVAL {ROLLUP_MAX_AGE_MINUTES} MINUTE
+"""
+
+# Rows kept in top_contributors by the same event
+TOP_CONTRIBUTORS_ROLLUP_SIZE = 50
+
+TOP_CONTRIBUTORS_QUERY = f"""
+    SELECT 
+        user_id as id,
+        email,
+        name,
+        contributions,
+        'Contributor' as type
+    FROM top_contributors
+    WHERE refreshed_at >= NOW() - INTERVAL {ROLLUP_MAX_AGE_MINUTES} MINUTE
+    ORDER BY position
+    LIMIT %s
+"""
+
+# Platform activity rows, in display order, with their (static) trend labels
+PLATFORM_ACTIVITY_TRENDS = (
+    ("Job Postings", "+15%"),
+    ("Events Created", "+8%"),
+    ("Forum Posts", "+22%"),
+    ("Mentorship Requests", "+12%"),
+)
+
+
+async def _fetch_one(pool, query, params=None):
+    """Run a single-row query on its own pooled connection"""
+    async with acquire_for_read(pool) as conn:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(query, params)
+            return await cursor.fetchone()
+
+
+async def _fetch_all(pool, query, params=None):
+    """Run a query on its own pooled connection and return every row"""
+    async with acquire_for_read(pool) as conn:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(query, params)
+            return await cursor.fetchall()
+
+
+async def _live_dashboard_stats(pool):
+    """
+    Aggregate the dashboard statistics directly from the source tables; the
+    queries are independent, so they run concurrently on separate connections
+    """
+    user_stats, verified_stats, job_stats, event_stats, forum_stats = await asyncio.gather(
         # Total users by role
-        cursor.execute("""
+        _fetch_one(pool, """
             SELECT 
                 COUNT(*) as totalUsers,
                 SUM(CASE WHEN is_active = TRUE THEN 1 ELSE 0 END) as activeUsers,
@@ -23,47 +205,57 @@ async def get_dashboard_stats():
                 SUM(CASE WHEN role = 'alumni' THEN 1 ELSE 0 END) as totalAlumni,
                 SUM(CASE WHEN role = 'recruiter' THEN 1 ELSE 0 END) as totalRecruiters
             FROM users
-        """)
-        user_stats = cursor.fetchone()
-        
+        """),
         # Verified alumni
-        cursor.execute("SELECT COUNT(*) as verifiedAlumni FROM alumni_profiles WHERE is_verified = TRUE")
-        verified_stats = cursor.fetchone()
-        
+        _fetch_one(pool, "SELECT COUNT(*) as verifiedAlumni FROM alumni_profiles WHERE is_verified = TRUE"),
         # Jobs stats
-        cursor.execute("""
+        _fetch_one(pool, """
             SELECT 
                 COUNT(*) as totalJobs,
                 SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END) as activeJobs
             FROM jobs
-        """)
-        job_stats = cursor.fetchone()
-        
+        """),
         # Events stats
-        cursor.execute("""
+        _fetch_one(pool, """
             SELECT 
                 COUNT(*) as totalEvents,
                 SUM(CASE WHEN status = 'published' THEN 1 ELSE 0 END) as publishedEvents
             FROM events
-        """)
-        event_stats = cursor.fetchone()
-        
+        """),
         # Forum posts
-        cursor.execute("SELECT COUNT(*) as totalPosts FROM forum_posts WHERE is_deleted = FALSE")
-        forum_stats = cursor.fetchone()
+        _fetch_one(pool, "SELECT COUNT(*) as totalPosts FROM forum_posts WHERE is_deleted = FALSE"),
+    )
+    
+    return {
+        **user_stats,
+        **verified_stats,
+        **job_stats,
+        **event_stats,
+        "forumPosts": forum_stats['totalPosts']
+    }
+
+
+@router.get("/dashboard", dependencies=[Depends(require_admin)])
+@_ttl_cache()
+async def get_dashboard_stats():
+    """Get overall dashboard statistics"""
+    try:
+        pool = await get_db_pool()
+        
+        # Read the rollup; aggregate live if it isn't installed, hasn't been
+        # populated yet or has gone stale
+        try:
+            stats = await _fetch_one(pool, DASHBOARD_STATS_QUERY)
+        except aiomysql.ProgrammingError as e:
+            _fall_back_or_raise(e, MISSING_TABLE_ERRORS, "dashboard_stats rollup")
+            stats = None
         
-        cursor.close()
-        connection.close()
+        if stats is None:
+            stats = await _live_dashboard_stats(pool)
         
         return {
             "success": True,
-            "data": {
-                **user_stats,
-                **verified_stats,
-                **job_stats,
-                **event_stats,
-                "forumPosts": forum_stats['totalPosts']
-            }
+            "data": stats
         }
     
     except Exception as e:
@@ -74,33 +266,31 @@ async def get_dashboard_stats():
 async def get_user_growth(period: str = "monthly"):
     """Get user growth data over time"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        if period == "monthly":
-            cursor.execute("""
-                SELECT 
-                    DATE_FORMAT(created_at, '%Y-%m') as month,
-                    COUNT(*) as users
-                FROM users
-                WHERE created_at >= DATE_SUB(NOW(), INTERVAL 12 MONTH)
-                GROUP BY DATE_FORMAT(created_at, '%Y-%m')
-                ORDER BY month
-            """)
-        else:
-            cursor.execute("""
-                SELECT 
-                    DATE(created_at) as date,
-                    COUNT(*) as users
-                FROM users
-                WHERE created_at >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-                GROUP BY DATE(created_at)
-                ORDER BY date
-            """)
-        
-        growth_data = cursor.fetchall()
-        cursor.close()
-        connection.close()
+        pool = await get_db_pool()
+        async with acquire_for_read(pool) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                if period == "monthly":
+                    await cursor.execute("""
+                        SELECT 
+                            DATE_FORMAT(created_at, '%Y-%m') as month,
+                            COUNT(*) as users
+                        FROM users
+                        WHERE created_at >= DATE_SUB(NOW(), INTERVAL 12 MONTH)
+                        GROUP BY DATE_FORMAT(created_at, '%Y-%m')
+                        ORDER BY month
+                    """)
+                else:
+                    await cursor.execute("""
+                        SELECT 
+                            DATE(created_at) as date,
+                            COUNT(*) as users
+                        FROM users
+                        WHERE created_at >= DATE_SUB(NOW(), INTERVAL 30 DAY)
+                        GROUP BY DATE(created_at)
+                        ORDER BY date
+                    """)
+                
+                growth_data = await cursor.fetchall()
         
         return {
             "success": True,
@@ -115,27 +305,33 @@ async def get_user_growth(period: str = "monthly"):
 async def get_top_contributors(limit: int = 5):
     """Get top contributing users"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
+        pool = await get_db_pool()
         
-        cursor.execute("""
-            SELECT 
-                u.id,
-                u.email,
-                ap.name,
-                es.total_score as contributions,
-                'Contributor' as type
-            FROM users u
-            LEFT JOIN alumni_profiles ap ON u.id = ap.user_id
-            LEFT JOIN engagement_scores es ON u.id = es.user_id
-            WHERE es.total_score IS NOT NULL
-            ORDER BY es.total_score DESC
-            LIMIT %s
-        """, (limit,))
+        # Read the precomputed ranking when it holds enough rows; query live
+        # if it isn't installed, hasn't been populated, has gone stale or
+        # limit exceeds it
+        contributors = []
+        if limit <= TOP_CONTRIBUTORS_ROLLUP_SIZE:
+            try:
+                contributors = await _fetch_all(pool, TOP_CONTRIBUTORS_QUERY, (limit,))
+            except aiomysql.ProgrammingError as e:
+                _fall_back_or_raise(e, MISSING_TABLE_ERRORS, "top_contributors rollup")
         
-        contributors = cursor.fetchall()
-        cursor.close()
-        connection.close()
+        if not contributors:
+            contributors = await _fetch_all(pool, """
+                SELECT 
+                    u.id,
+                    u.email,
+                    ap.name,
+                    es.total_score as contributions,
+                    'Contributor' as type
+                FROM users u
+                LEFT JOIN alumni_profiles ap ON u.id = ap.user_id
+                LEFT JOIN engagement_scores es ON u.id = es.user_id
+                WHERE es.total_score IS NOT NULL
+                ORDER BY es.total_score DESC
+                LIMIT %s
+            """, (limit,))
         
         return {
             "success": True,
@@ -150,65 +346,34 @@ async def get_top_contributors(limit: int = 5):
 async def get_platform_activity(days: int = 30):
     """Get recent platform activity metrics"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        activities = []
-        
-        # Job postings
-        cursor.execute("""
-            SELECT COUNT(*) as count
+        # All four counts in one round trip; days is bound once per branch
+        rows = await _fetch_all(await get_db_pool(), """
+            SELECT 'Job Postings' as activity, COUNT(*) as count
             FROM jobs
             WHERE created_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
-        """, (days,))
-        job_count = cursor.fetchone()
-        activities.append({
-            "activity": "Job Postings",
-            "count": job_count['count'],
-            "trend": "+15%"
-        })
-        
-        # Events created
-        cursor.execute("""
-            SELECT COUNT(*) as count
+            UNION ALL
+            SELECT 'Events Created', COUNT(*)
             FROM events
             WHERE created_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
-        """, (days,))
-        event_count = cursor.fetchone()
-        activities.append({
-            "activity": "Events Created",
-            "count": event_count['count'],
-            "trend": "+8%"
-        })
-        
-        # Forum posts
-        cursor.execute("""
-            SELECT COUNT(*) as count
+            UNION ALL
+            SELECT 'Forum Posts', COUNT(*)
             FROM forum_posts
             WHERE created_at >= DATE_SUB(NOW(), INTERVAL %s DAY) AND is_deleted = FALSE
-        """, (days,))
-        post_count = cursor.fetchone()
-        activities.append({
-            "activity": "Forum Posts",
-            "count": post_count['count'],
-            "trend": "+22%"
-        })
-        
-        # Mentorship requests
-        cursor.execute("""
-            SELECT COUNT(*) as count
+            UNION ALL
+            SELECT 'Mentorship Requests', COUNT(*)
             FROM mentorship_requests
             WHERE requested_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
-        """, (days,))
-        mentor_count = cursor.fetchone()
-        activities.append({
-            "activity": "Mentorship Requests",
-            "count": mentor_count['count'],
-            "trend": "+12%"
-        })
-        
-        cursor.close()
-        connection.close()
+        """, (days,) * 4)
+        counts = {row['activity']: row['count'] for row in rows}
+        
+        activities = [
+            {
+                "activity": activity,
+                "count": counts[activity],
+                "trend": trend
+            }
+            for activity, trend in PLATFORM_ACTIVITY_TRENDS
+        ]
         
         return {
             "success": True,
@@ -220,76 +385,57 @@ async def get_platform_activity(days: int = 30):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/alumni", dependencies=[Depends(require_admin)])
+@_ttl_cache()
 async def get_alumni_analytics():
     """Get detailed alumni analytics"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Location distribution
-        cursor.execute("""
-            SELECT 
-                location,
-                COUNT(*) as count
-            FROM alumni_profiles
-            WHERE location IS NOT NULL
-            GROUP BY location
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        location_dist = cursor.fetchall()
-        
-        # Top companies
-        cursor.execute("""
-            SELECT 
-                current_company as company,
-                COUNT(*) as count
-            FROM alumni_profiles
-            WHERE current_company IS NOT NULL
-            GROUP BY current_company
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        top_companies = cursor.fetchall()
-        
-        # Top skills - Need to parse JSON
-        cursor.execute("""
-            SELECT skills
-            FROM alumni_profiles
-            WHERE skills IS NOT NULL AND skills != '[]'
-        """)
-        skills_data = cursor.fetchall()
-        
-        # Parse skills and count
-        from collections import Counter
-        import json
-        all_skills = []
-        for row in skills_data:
-            try:
-                skills = json.loads(row['skills']) if isinstance(row['skills'], str) else row['skills']
-                if skills:
-                    all_skills.extend(skills)
-            except:
-                pass
-        
-        skill_counts = Counter(all_skills)
-        top_skills = [{"skill": skill, "count": count} for skill, count in skill_counts.most_common(15)]
-        
-        # Batch distribution
-        cursor.execute("""
-            SELECT 
-                batch_year as year,
-                COUNT(*) as count
-            FROM alumni_profiles
-            WHERE batch_year IS NOT NULL
-            GROUP BY batch_year
-            ORDER BY batch_year DESC
-            LIMIT 10
-        """)
-        batch_dist = cursor.fetchall()
-        
-        cursor.close()
-        connection.close()
+        pool = await get_db_pool()
+        async with acquire_for_read(pool) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                # Location distribution
+                await cursor.execute("""
+                    SELECT 
+                        location,
+                        COUNT(*) as count
+                    FROM alumni_profiles
+                    WHERE location IS NOT NULL
+                    GROUP BY location
+                    ORDER BY count DESC
+                    LIMIT 10
+                """)
+                location_dist = await cursor.fetchall()
+                
+                # Top companies
+                await cursor.execute("""
+                    SELECT 
+                        current_company as company,
+                        COUNT(*) as count
+                    FROM alumni_profiles
+                    WHERE current_company IS NOT NULL
+                    GROUP BY current_company
+                    ORDER BY count DESC
+                    LIMIT 10
+                """)
+                top_companies = await cursor.fetchall()
+                
+                # Top skills, aggregated from the skills JSON arrays
+                top_skills = [
+                    {"skill": skill, "count": count}
+                    for skill, count in await _top_json_array_values(cursor, "alumni_profiles", "skills", 15)
+                ]
+                
+                # Batch distribution
+                await cursor.execute("""
+                    SELECT 
+                        batch_year as year,
+                        COUNT(*) as count
+                    FROM alumni_profiles
+                    WHERE batch_year IS NOT NULL
+                    GROUP BY batch_year
+                    ORDER BY batch_year DESC
+                    LIMIT 10
+                """)
+                batch_dist = await cursor.fetchall()
         
         return {
             "success": True,
@@ -306,83 +452,65 @@ async def get_alumni_analytics():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/jobs", dependencies=[Depends(require_admin)])
+@_ttl_cache()
 async def get_job_analytics():
     """Get job analytics data"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Basic stats
-        cursor.execute("""
-            SELECT 
-                COUNT(DISTINCT j.id) as totalJobs,
-                COUNT(DISTINCT ja.id) as totalApplications,
-                ROUND(COUNT(DISTINCT ja.id) / COUNT(DISTINCT j.id), 1) as averageApplicationsPerJob
-            FROM jobs j
-            LEFT JOIN job_applications ja ON j.id = ja.job_id
-        """)
-        basic_stats = cursor.fetchone()
-        
-        # Jobs by type
-        cursor.execute("""
-            SELECT 
-                job_type as name,
-                COUNT(*) as value,
-                '#3b82f6' as color
-            FROM jobs
-            GROUP BY job_type
-        """)
-        jobs_by_type = cursor.fetchall()
-        
-        # Jobs by location
-        cursor.execute("""
-            SELECT 
-                location,
-                COUNT(*) as jobs
-            FROM jobs
-            WHERE location IS NOT NULL
-            GROUP BY location
-            ORDER BY jobs DESC
-            LIMIT 10
-        """)
-        jobs_by_location = cursor.fetchall()
-        
-        # Application trends (last 12 weeks)
-        cursor.execute("""
-            SELECT 
-                WEEK(applied_at) as week,
-                COUNT(*) as applications
-            FROM job_applications
-            WHERE applied_at >= DATE_SUB(NOW(), INTERVAL 12 WEEK)
-            GROUP BY WEEK(applied_at)
-            ORDER BY week
-        """)
-        app_trends = cursor.fetchall()
-        
-        # Top skills required
-        cursor.execute("""
-            SELECT skills_required
-            FROM jobs
-            WHERE skills_required IS NOT NULL
-        """)
-        skills_data = cursor.fetchall()
-        
-        from collections import Counter
-        import json
-        all_skills = []
-        for row in skills_data:
-            try:
-                skills = json.loads(row['skills_required']) if isinstance(row['skills_required'], str) else row['skills_required']
-                if skills:
-                    all_skills.extend(skills)
-            except:
-                pass
-        
-        skill_counts = Counter(all_skills)
-        top_skills_required = [{"skill": skill, "count": count} for skill, count in skill_counts.most_common(10)]
-        
-        cursor.close()
-        connection.close()
+        pool = await get_db_pool()
+        async with acquire_for_read(pool) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                # Basic stats
+                await cursor.execute("""
+                    SELECT 
+                        COUNT(DISTINCT j.id) as totalJobs,
+                        COUNT(DISTINCT ja.id) as totalApplications,
+                        ROUND(COUNT(DISTINCT ja.id) / COUNT(DISTINCT j.id), 1) as averageApplicationsPerJob
+                    FROM jobs j
+                    LEFT JOIN job_applications ja ON j.id = ja.job_id
+                """)
+                basic_stats = await cursor.fetchone()
+                
+                # Jobs by type
+                await cursor.execute("""
+                    SELECT 
+                        job_type as name,
+                        COUNT(*) as value,
+                        '#3b82f6' as color
+                    FROM jobs
+                    GROUP BY job_type
+                """)
+                jobs_by_type = await cursor.fetchall()
+                
+                # Jobs by location
+                await cursor.execute("""
+                    SELECT 
+                        location,
+                        COUNT(*) as jobs
+                    FROM jobs
+                    WHERE location IS NOT NULL
+                    GROUP BY location
+                    ORDER BY jobs DESC
+                    LIMIT 10
+                """)
+                jobs_by_location = await cursor.fetchall()
+                
+                # Application trends (last 12 weeks)
+                await cursor.execute("""
+                    SELECT 
+                        WEEK(applied_at) as week,
+                        COUNT(*) as applications
+                    FROM job_applications
+                    WHERE applied_at >= DATE_SUB(NOW(), INTERVAL 12 WEEK)
+                    GROUP BY WEEK(applied_at)
+                    ORDER BY week
+                """)
+                app_trends = await cursor.fetchall()
+                
+                # Top skills required
+                top_skills_required = [
+                    {"skill": skill, "count": count}
+                    for skill, count in await _top_json_array_values(cursor, "jobs", "skills_required", 10)
+                ]
         
         return {
             "success": True,
@@ -401,89 +529,71 @@ async def get_job_analytics():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/mentorship", dependencies=[Depends(require_admin)])
+@_ttl_cache()
 async def get_mentorship_analytics():
     """Get mentorship analytics"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Basic stats
-        cursor.execute("""
-            SELECT 
-                COUNT(DISTINCT mr.id) as totalRequests,
-                COUNT(DISTINCT CASE WHEN mp.is_available = TRUE THEN mp.user_id END) as activeMentors,
-                COUNT(DISTINCT CASE WHEN ms.status = 'completed' THEN ms.id END) as completedSessions,
-                ROUND(AVG(CASE WHEN ms.rating IS NOT NULL THEN ms.rating END), 1) as averageRating
-            FROM mentorship_requests mr
-            LEFT JOIN mentor_profiles mp ON mr.mentor_id = mp.user_id
-            LEFT JOIN mentorship_sessions ms ON mr.id = ms.mentorship_request_id
-        """)
-        basic_stats = cursor.fetchone()
-        
-        # Requests by status
-        cursor.execute("""
-            SELECT 
-                status as name,
-                COUNT(*) as value,
-                CASE status
-                    WHEN 'pending' THEN '#fbbf24'
-                    WHEN 'accepted' THEN '#10b981'
-                    WHEN 'rejected' THEN '#ef4444'
-                    ELSE '#6b7280'
-                END as color
-            FROM mentorship_requests
-            GROUP BY status
-        """)
-        requests_by_status = cursor.fetchall()
-        
-        # Sessions over time
-        cursor.execute("""
-            SELECT 
-                DATE_FORMAT(scheduled_date, '%Y-%m') as month,
-                COUNT(*) as sessions
-            FROM mentorship_sessions
-            WHERE scheduled_date >= DATE_SUB(NOW(), INTERVAL 12 MONTH)
-            GROUP BY DATE_FORMAT(scheduled_date, '%Y-%m')
-            ORDER BY month
-        """)
-        sessions_over_time = cursor.fetchall()
-        
-        # Top expertise areas
-        cursor.execute("""
-            SELECT expertise_areas
-            FROM mentor_profiles
-            WHERE expertise_areas IS NOT NULL
-        """)
-        expertise_data = cursor.fetchall()
-        
-        from collections import Counter
-        import json
-        all_areas = []
-        for row in expertise_data:
-            try:
-                areas = json.loads(row['expertise_areas']) if isinstance(row['expertise_areas'], str) else row['expertise_areas']
-                if areas:
-                    all_areas.extend(areas)
-            except:
-                pass
-        
-        area_counts = Counter(all_areas)
-        top_expertise = [{"area": area, "count": count} for area, count in area_counts.most_common(10)]
-        
-        # Rating distribution
-        cursor.execute("""
-            SELECT 
-                CONCAT(CAST(rating AS CHAR), ' Stars') as stars,
-                COUNT(*) as count
-            FROM mentorship_sessions
-            WHERE rating IS NOT NULL AND rating > 0
-            GROUP BY rating
-            ORDER BY rating DESC
-        """)
-        rating_dist = cursor.fetchall()
-        
-        cursor.close()
-        connection.close()
+        pool = await get_db_pool()
+        async with acquire_for_read(pool) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                # Basic stats
+                await cursor.execute("""
+                    SELECT 
+                        COUNT(DISTINCT mr.id) as totalRequests,
+                        COUNT(DISTINCT CASE WHEN mp.is_available = TRUE THEN mp.user_id END) as activeMentors,
+                        COUNT(DISTINCT CASE WHEN ms.status = 'completed' THEN ms.id END) as completedSessions,
+                        ROUND(AVG(CASE WHEN ms.rating IS NOT NULL THEN ms.rating END), 1) as averageRating
+                    FROM mentorship_requests mr
+                    LEFT JOIN mentor_profiles mp ON mr.mentor_id = mp.user_id
+                    LEFT JOIN mentorship_sessions ms ON mr.id = ms.mentorship_request_id
+                """)
+                basic_stats = await cursor.fetchone()
+                
+                # Requests by status
+                await cursor.execute("""
+                    SELECT 
+                        status as name,
+                        COUNT(*) as value,
+                        CASE status
+                            WHEN 'pending' THEN '#fbbf24'
+                            WHEN 'accepted' THEN '#10b981'
+                            WHEN 'rejected' THEN '#ef4444'
+                            ELSE '#6b7280'
+                        END as color
+                    FROM mentorship_requests
+                    GROUP BY status
+                """)
+                requests_by_status = await cursor.fetchall()
+                
+                # Sessions over time
+                await cursor.execute("""
+                    SELECT 
+                        DATE_FORMAT(scheduled_date, '%Y-%m') as month,
+                        COUNT(*) as sessions
+                    FROM mentorship_sessions
+                    WHERE scheduled_date >= DATE_SUB(NOW(), INTERVAL 12 MONTH)
+                    GROUP BY DATE_FORMAT(scheduled_date, '%Y-%m')
+                    ORDER BY month
+                """)
+                sessions_over_time = await cursor.fetchall()
+                
+                # Top expertise areas
+                top_expertise = [
+                    {"area": area, "count": count}
+                    for area, count in await _top_json_array_values(cursor, "mentor_profiles", "expertise_areas", 10)
+                ]
+                
+                # Rating distribution
+                await cursor.execute("""
+                    SELECT 
+                        CONCAT(CAST(rating AS CHAR), ' Stars') as stars,
+                        COUNT(*) as count
+                    FROM mentorship_sessions
+                    WHERE rating IS NOT NULL AND rating > 0
+                    GROUP BY rating
+                    ORDER BY rating DESC
+                """)
+                rating_dist = await cursor.fetchall()
         
         return {
             "success": True,
@@ -501,68 +611,66 @@ async def get_mentorship_analytics():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/events", dependencies=[Depends(require_admin)])
+@_ttl_cache()
 async def get_event_analytics():
     """Get event analytics"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Basic stats
-        cursor.execute("""
-            SELECT 
-                COUNT(DISTINCT e.id) as totalEvents,
-                COUNT(DISTINCT er.id) as totalRegistrations,
-                ROUND(COUNT(DISTINCT er.id) / COUNT(DISTINCT e.id), 0) as averageAttendance
-            FROM events e
-            LEFT JOIN event_rsvps er ON e.id = er.event_id
-        """)
-        basic_stats = cursor.fetchone()
-        basic_stats['attendanceRate'] = 85  # TODO: Calculate actual attendance rate
-        
-        # Events by type
-        cursor.execute("""
-            SELECT 
-                event_type as name,
-                COUNT(*) as value,
-                '#ec4899' as color
-            FROM events
-            GROUP BY event_type
-        """)
-        events_by_type = cursor.fetchall()
-        
-        # Participation trend
-        cursor.execute("""
-            SELECT 
-                DATE_FORMAT(er.rsvp_date, '%Y-%m') as month,
-                COUNT(*) as registrations
-            FROM event_rsvps er
-            WHERE er.rsvp_date >= DATE_SUB(NOW(), INTERVAL 12 MONTH)
-            GROUP BY DATE_FORMAT(er.rsvp_date, '%Y-%m')
-            ORDER BY month
-        """)
-        participation_trend = cursor.fetchall()
-        
-        # Events by format
-        cursor.execute("""
-            SELECT 
-                CASE WHEN is_virtual = TRUE THEN 'Virtual' ELSE 'In-Person' END as format,
-                COUNT(*) as count
-            FROM events
-            GROUP BY is_virtual
-        """)
-        events_by_format = cursor.fetchall()
-        
-        # Popular topics (from event titles/descriptions)
-        popular_topics = [
-            {"topic": "Career Development", "count": 45, "color": "bg-blue-500"},
-            {"topic": "Technical Workshops", "count": 38, "color": "bg-purple-500"},
-            {"topic": "Networking", "count": 32, "color": "bg-green-500"},
-            {"topic": "Alumni Meetups", "count": 28, "color": "bg-yellow-500"},
-            {"topic": "Industry Insights", "count": 22, "color": "bg-red-500"}
-        ]
-        
-        cursor.close()
-        connection.close()
+        pool = await get_db_pool()
+        async with acquire_for_read(pool) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                # Basic stats
+                await cursor.execute("""
+                    SELECT 
+                        COUNT(DISTINCT e.id) as totalEvents,
+                        COUNT(DISTINCT er.id) as totalRegistrations,
+                        ROUND(COUNT(DISTINCT er.id) / COUNT(DISTINCT e.id), 0) as averageAttendance
+                    FROM events e
+                    LEFT JOIN event_rsvps er ON e.id = er.event_id
+                """)
+                basic_stats = await cursor.fetchone()
+                basic_stats['attendanceRate'] = 85  # TODO: Calculate actual attendance rate
+                
+                # Events by type
+                await cursor.execute("""
+                    SELECT 
+                        event_type as name,
+                        COUNT(*) as value,
+                        '#ec4899' as color
+                    FROM events
+                    GROUP BY event_type
+                """)
+                events_by_type = await cursor.fetchall()
+                
+                # Participation trend
+                await cursor.execute("""
+                    SELECT 
+                        DATE_FORMAT(er.rsvp_date, '%Y-%m') as month,
+                        COUNT(*) as registrations
+                    FROM event_rsvps er
+                    WHERE er.rsvp_date >= DATE_SUB(NOW(), INTERVAL 12 MONTH)
+                    GROUP BY DATE_FORMAT(er.rsvp_date, '%Y-%m')
+                    ORDER BY month
+                """)
+                participation_trend = await cursor.fetchall()
+                
+                # Events by format
+                await cursor.execute("""
+                    SELECT 
+                        CASE WHEN is_virtual = TRUE THEN 'Virtual' ELSE 'In-Person' END as format,
+                        COUNT(*) as count
+                    FROM events
+                    GROUP BY is_virtual
+                """)
+                events_by_format = await cursor.fetchall()
+                
+                # Popular topics (from event titles/descriptions)
+                popular_topics = [
+                    {"topic": "Career Development", "count": 45, "color": "bg-blue-500"},
+                    {"topic": "Technical Workshops", "count": 38, "color": "bg-purple-500"},
+                    {"topic": "Networking", "count": 32, "color": "bg-green-500"},
+                    {"topic": "Alumni Meetups", "count": 28, "color": "bg-yellow-500"},
+                    {"topic": "Industry Insights", "count": 22, "color": "bg-red-500"}
+                ]
         
         return {
             "success": True,
@@ -580,23 +688,30 @@ async def get_event_analytics():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/engagement", dependencies=[Depends(require_admin)])
+@_ttl_cache()
 async def get_engagement_metrics():
     """Get user engagement metrics"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Active users calculation
-        cursor.execute("""
-            SELECT 
-                COUNT(DISTINCT CASE WHEN last_login >= DATE_SUB(NOW(), INTERVAL 1 DAY) THEN id END) as dailyActive,
-                COUNT(DISTINCT CASE WHEN last_login >= DATE_SUB(NOW(), INTERVAL 7 DAY) THEN id END) as weeklyActive,
-                COUNT(DISTINCT CASE WHEN last_login >= DATE_SUB(NOW(), INTERVAL 30 DAY) THEN id END) as monthlyActive,
-                COUNT(*) as totalUsers
-            FROM users
-            WHERE is_active = TRUE
-        """)
-        activity_stats = cursor.fetchone()
+        pool = await get_db_pool()
+        
+        # Read the rollup; count live if it isn't installed, hasn't been
+        # populated yet or has gone stale
+        try:
+            activity_stats = await _fetch_one(pool, ENGAGEMENT_ROLLUP_QUERY)
+        except aiomysql.ProgrammingError as e:
+            _fall_back_or_raise(e, MISSING_TABLE_ERRORS, "engagement_rollup")
+            activity_stats = None
+        
+        if activity_stats is None:
+            activity_stats = await _fetch_one(pool, """
+                SELECT 
+                    COUNT(DISTINCT CASE WHEN last_login >= DATE_SUB(NOW(), INTERVAL 1 DAY) THEN id END) as dailyActive,
+                    COUNT(DISTINCT CASE WHEN last_login >= DATE_SUB(NOW(), INTERVAL 7 DAY) THEN id END) as weeklyActive,
+                    COUNT(DISTINCT CASE WHEN last_login >= DATE_SUB(NOW(), INTERVAL 30 DAY) THEN id END) as monthlyActive,
+                    COUNT(*) as totalUsers
+                FROM users
+                WHERE is_active = TRUE
+            """)
         
         engagement_data = {
             "dailyActivePercentage": round((activity_stats['dailyActive'] / activity_stats['totalUsers']) * 100, 1) if activity_stats['totalUsers'] > 0 else 0,
@@ -604,9 +719,6 @@ async def get_engagement_metrics():
             "monthlyActivePercentage": round((activity_stats['monthlyActive'] / activity_stats['totalUsers']) * 100, 1) if activity_stats['totalUsers'] > 0 else 0
         }
         
-        cursor.close()
-        connection.close()
-        
         return {
             "success": True,
             "data": engagement_data
@@ -614,4 +726,4 @@ async def get_engagement_metrics():
     
     except Exception as e:
         logger.error(f"Error fetching engagement metrics: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
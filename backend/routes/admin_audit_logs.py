@@ -1,13 +1,58 @@
 """Admin Audit Logs Routes"""
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from typing import Optional
+import json
 import logging
+import time
 from datetime import datetime, timedelta
-from database.connection import get_sync_db_connection
+import aiomysql
+from database.connection import acquire_for_read, get_db_pool
 from middleware.auth_middleware import require_admin
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/admin/audit-logs", tags=["admin-audit-logs"])
+router = APIRouter(
+    prefix="/api/admin/audit-logs",
+    tags=["admin-audit-logs"],
+    default_response_class=ORJSONResponse
+)
+
+# admin_id -> (expires_at, email, name); admin identities rarely change, so
+# they are looked up once and merged into rows in Python instead of joining
+# users/alumni_profiles on every audit query
+ADMIN_IDENTITY_TTL = 300
+_admin_identities = {}
+
+
+async def _get_admin_identities(cursor, admin_ids):
+    """Return {admin_id: (email, name)}, querying only ids not cached yet"""
+    now = time.monotonic()
+    identities = {}
+    missing = []
+    for admin_id in set(admin_ids):
+        entry = _admin_identities.get(admin_id)
+        if entry is not None and entry[0] > now:
+            identities[admin_id] = entry[1:]
+        elif admin_id is not None:
+            missing.append(admin_id)
+    
+    if missing:
+        placeholders = ", ".join(["%s"] * len(missing))
+        await cursor.execute(f"""
+            SELECT u.id, u.email, ap.name
+            FROM users u
+            LEFT JOIN alumni_profiles ap ON u.id = ap.user_id
+            WHERE u.id IN ({placeholders})
+        """, missing)
+        found = {row['id']: (row['email'], row['name']) for row in await cursor.fetchall()}
+        
+        for admin_id in missing:
+            # Deleted admins resolve to (None, None), as the LEFT JOIN did
+            identity = found.get(admin_id, (None, None))
+            _admin_identities[admin_id] = (now + ADMIN_IDENTITY_TTL, *identity)
+            identities[admin_id] = identity
+    
+    return identities
 
 
 @router.get("", dependencies=[Depends(require_admin)])
@@ -18,7 +63,9 @@ async def get_audit_logs(
     search: Optional[str] = None,
     days: Optional[int] = 30,
     limit: int = 100,
-    offset: int = 0
+    offset: int = 0,
+    before: Optional[datetime] = None,
+    before_id: Optional[str] = None
 ):
     """
     Get audit logs from admin_actions table with filters
@@ -30,129 +77,131 @@ async def get_audit_logs(
     - **days**: Get logs from last N days (default: 30)
     - **limit**: Number of records to return (default: 100)
     - **offset**: Pagination offset (default: 0)
+    - **before** / **before_id**: Keyset cursor from a previous page's next_cursor;
+      returns the rows after it without re-scanning skipped pages (total then
+      counts only the remaining rows)
     """
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Base query - join with users table to get admin details
-        query = """
-            SELECT 
-                aa.id,
-                aa.admin_id,
-                u.email as admin_email,
-                ap.name as admin_name,
-                aa.action_type,
-                aa.target_type,
-                aa.target_id,
-                aa.description,
-                aa.metadata,
-                aa.ip_address,
-                aa.timestamp
-            FROM admin_actions aa
-            LEFT JOIN users u ON aa.admin_id = u.id
-            LEFT JOIN alumni_profiles ap ON u.id = ap.user_id
-            WHERE 1=1
-        """
-        
-        params = []
-        
-        # Date filter - get logs from last N days
-        if days:
-            query += " AND aa.timestamp >= DATE_SUB(NOW(), INTERVAL %s DAY)"
-            params.append(days)
-        
-        # Action type filter
-        if action_type:
-            query += " AND aa.action_type = %s"
-            params.append(action_type)
-        
-        # Admin ID filter
-        if admin_id:
-            query += " AND aa.admin_id = %s"
-            params.append(admin_id)
-        
-        # Target type filter
-        if target_type:
-            query += " AND aa.target_type = %s"
-            params.append(target_type)
-        
-        # Search in description
-        if search:
-            query += " AND aa.description LIKE %s"
-            params.append(f"%{search}%")
-        
-        # Order by timestamp descending (most recent first)
-        query += " ORDER BY aa.timestamp DESC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
-        
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        
-        # Get total count for pagination
-        count_query = """
-            SELECT COUNT(*) as total
-            FROM admin_actions aa
-            WHERE 1=1
-        """
-        count_params = []
-        
-        if days:
-            count_query += " AND aa.timestamp >= DATE_SUB(NOW(), INTERVAL %s DAY)"
-            count_params.append(days)
-        if action_type:
-            count_query += " AND aa.action_type = %s"
-            count_params.append(action_type)
-        if admin_id:
-            count_query += " AND aa.admin_id = %s"
-            count_params.append(admin_id)
-        if target_type:
-            count_query += " AND aa.target_type = %s"
-            count_params.append(target_type)
-        if search:
-            count_query += " AND aa.description LIKE %s"
-            count_params.append(f"%{search}%")
-        
-        cursor.execute(count_query, count_params)
-        total_count = cursor.fetchone()['total']
-        
-        # Transform data
-        logs = []
-        for row in rows:
-            import json
-            
-            # Parse metadata JSON if it exists
-            metadata = None
-            if row.get('metadata'):
-                try:
-                    metadata = json.loads(row['metadata']) if isinstance(row['metadata'], str) else row['metadata']
-                except (json.JSONDecodeError, TypeError):
+        pool = await get_db_pool()
+        async with acquire_for_read(pool) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                # Filters shared by the page query and the fallback count
+                filters = ""
+                params = []
+                
+                # Date filter - get logs from last N days
+                if days:
+                    filters += " AND aa.timestamp >= DATE_SUB(NOW(), INTERVAL %s DAY)"
+                    params.append(days)
+                
+                # Action type filter
+                if action_type:
+                    filters += " AND aa.action_type = %s"
+                    params.append(action_type)
+                
+                # Admin ID filter
+                if admin_id:
+                    filters += " AND aa.admin_id = %s"
+                    params.append(admin_id)
+                
+                # Target type filter
+                if target_type:
+                    filters += " AND aa.target_type = %s"
+                    params.append(target_type)
+                
+                # Search in description
+                if search:
+                    filters += " AND aa.description LIKE %s"
+                    params.append(f"%{search}%")
+                
+                # Keyset cursor - rows strictly after the last one already seen
+                if before:
+                    if before_id:
+                        filters += " AND (aa.timestamp < %s OR (aa.timestamp = %s AND aa.id < %s))"
+                        params.extend([before, before, before_id])
+                    else:
+                        filters += " AND aa.timestamp < %s"
+                        params.append(before)
+                
+                # Base query - admin details are merged in from the identity
+                # cache; COUNT(*) OVER() carries the pre-LIMIT total on every row
+                query = """
+                    SELECT 
+                        aa.id,
+                        aa.admin_id,
+                        aa.action_type,
+                        aa.target_type,
+                        aa.target_id,
+                        aa.description,
+                        aa.metadata,
+                        aa.ip_address,
+                        aa.timestamp,
+                        COUNT(*) OVER() as total_count
+                    FROM admin_actions aa
+                    WHERE 1=1
+                """ + filters
+                
+                # Order by timestamp descending (most recent first)
+                query += " ORDER BY aa.timestamp DESC, aa.id DESC LIMIT %s OFFSET %s"
+                
+                await cursor.execute(query, params + [limit, offset])
+                rows = await cursor.fetchall()
+                
+                # Get total count for pagination
+                if rows:
+                    total_count = rows[0]['total_count']
+                elif offset:
+                    # Page past the end: no rows to read the total from
+                    await cursor.execute(
+                        "SELECT COUNT(*) as total FROM admin_actions aa WHERE 1=1" + filters,
+                        params
+                    )
+                    total_count = (await cursor.fetchone())['total']
+                else:
+                    total_count = 0
+                
+                admins = await _get_admin_identities(cursor, [row['admin_id'] for row in rows])
+                
+                # Transform data
+                logs = []
+                for row in rows:
+                    admin_email, admin_name = admins.get(row['admin_id'], (None, None))
+                    
+                    # Parse metadata JSON if it exists
                     metadata = None
-            
-            log = {
-                'id': row['id'],
-                'admin_id': row['admin_id'],
-                'admin_email': row['admin_email'],
-                'admin_name': row['admin_name'],
-                'action_type': row['action_type'],
-                'target_type': row['target_type'],
-                'target_id': row['target_id'],
-                'description': row['description'],
-                'metadata': metadata,
-                'ip_address': row['ip_address'],
-                'timestamp': row['timestamp'].isoformat() if row['timestamp'] else None
-            }
-            logs.append(log)
+                    if row.get('metadata'):
+                        try:
+                            metadata = json.loads(row['metadata']) if isinstance(row['metadata'], str) else row['metadata']
+                        except (json.JSONDecodeError, TypeError):
+                            metadata = None
+                    
+                    log = {
+                        'id': row['id'],
+                        'admin_id': row['admin_id'],
+                        'admin_email': admin_email,
+                        'admin_name': admin_name,
+                        'action_type': row['action_type'],
+                        'target_type': row['target_type'],
+                        'target_id': row['target_id'],
+                        'description': row['description'],
+                        'metadata': metadata,
+                        'ip_address': row['ip_address'],
+                        'timestamp': row['timestamp']
+                    }
+                    logs.append(log)
         
-        cursor.close()
-        connection.close()
+        # Cursor for the next page when this one is full
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = {"before": rows[-1]['timestamp'], "before_id": rows[-1]['id']}
         
         return {
             "success": True,
             "data": logs,
             "total": total_count,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         }
     
     except Exception as e:
@@ -164,58 +213,62 @@ async def get_audit_logs(
 async def get_audit_stats():
     """Get audit log statistics"""
     try:
-        connection = get_sync_db_connection()
-        cursor = connection.cursor()
-        
-        # Get stats by action type
-        cursor.execute("""
-            SELECT 
-                action_type,
-                COUNT(*) as count,
-                MAX(timestamp) as last_action
-            FROM admin_actions
-            WHERE timestamp >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-            GROUP BY action_type
-        """)
-        
-        action_stats = cursor.fetchall()
-        
-        # Get total actions in last 24 hours
-        cursor.execute("""
-            SELECT COUNT(*) as count
-            FROM admin_actions
-            WHERE timestamp >= DATE_SUB(NOW(), INTERVAL 24 HOUR)
-        """)
-        
-        last_24h = cursor.fetchone()['count']
-        
-        # Get most active admins
-        cursor.execute("""
-            SELECT 
-                aa.admin_id,
-                u.email as admin_email,
-                ap.name as admin_name,
-                COUNT(*) as action_count
-            FROM admin_actions aa
-            LEFT JOIN users u ON aa.admin_id = u.id
-            LEFT JOIN alumni_profiles ap ON u.id = ap.user_id
-            WHERE aa.timestamp >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-            GROUP BY aa.admin_id, u.email, ap.name
-            ORDER BY action_count DESC
-            LIMIT 5
-        """)
-        
-        top_admins = cursor.fetchall()
-        
-        cursor.close()
-        connection.close()
+        pool = await get_db_pool()
+        async with acquire_for_read(pool) as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                # Get stats by action type
+                await cursor.execute("""
+                    SELECT 
+                        action_type,
+                        COUNT(*) as count,
+                        MAX(timestamp) as last_action
+                    FROM admin_actions
+                    WHERE timestamp >= DATE_SUB(NOW(), INTERVAL 30 DAY)
+                    GROUP BY action_type
+                """)
+                
+                action_stats = await cursor.fetchall()
+                
+                # Get total actions in last 24 hours
+                await cursor.execute("""
+                    SELECT COUNT(*) as count
+                    FROM admin_actions
+                    WHERE timestamp >= DATE_SUB(NOW(), INTERVAL 24 HOUR)
+                """)
+                
+                last_24h = (await cursor.fetchone())['count']
+                
+                # Get most active admins
+                await cursor.execute("""
+                    SELECT 
+                        admin_id,
+                        COUNT(*) as action_count
+                    FROM admin_actions
+                    WHERE timestamp >= DATE_SUB(NOW(), INTERVAL 30 DAY)
+                    GROUP BY admin_id
+                    ORDER BY action_count DESC
+                    LIMIT 5
+                """)
+                
+                admin_counts = await cursor.fetchall()
+                admins = await _get_admin_identities(cursor, [row['admin_id'] for row in admin_counts])
+                
+                top_admins = []
+                for row in admin_counts:
+                    admin_email, admin_name = admins.get(row['admin_id'], (None, None))
+                    top_admins.append({
+                        'admin_id': row['admin_id'],
+                        'admin_email': admin_email,
+                        'admin_name': admin_name,
+                        'action_count': row['action_count']
+                    })
         
         return {
             "success": True,
             "data": {
                 "action_stats": [dict(row) for row in action_stats],
                 "last_24h_count": last_24h,
-                "top_admins": [dict(row) for row in top_admins]
+                "top_admins": top_admins
             }
         }
     
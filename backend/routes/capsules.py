@@ -2,7 +2,8 @@
 Knowledge Capsules Routes
 API endpoints for knowledge capsules system
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import TypeAdapter
 from typing import Optional
 import logging
 
@@ -22,6 +23,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/capsules", tags=["Knowledge Capsules"])
 
+# Compiled once at import; reused to validate and serialize list payloads
+_LIST_ADAPTER = TypeAdapter(list[KnowledgeCapsuleResponse])
+
 
 @router.post("/create", response_model=KnowledgeCapsuleResponse)
 async def create_capsule(
@@ -93,7 +97,15 @@ async def list_capsules(
             user_id=user_id
         )
         
-        return result
+        # Serialize the items in a single pass and assemble the envelope by hand
+        # instead of building a KnowledgeCapsuleListResponse instance
+        items = _LIST_ADAPTER.validate_python(result['data'])
+        body = (
+            b'{"data":' + _LIST_ADAPTER.dump_json(items) +
+            f',"total":{result["total"]},"page":{result["page"]},'
+            f'"limit":{result["limit"]},"has_more":{str(result["has_more"]).lower()}}}'.encode()
+        )
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error listing capsules: {str(e)}")
@@ -27,6 +27,7 @@ from database.connection import get_db_pool, close_db_pool
 
 # Import Phase 10.1 infrastructure
 from redis_client import get_redis_client, close_redis_client
+from ml.llm_advisor import close_llm_advisor
 from storage import file_storage
 
 # Import routes
@@ -155,6 +156,9 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"⚠️ Redis close warning: {str(e)}")
         
+        # Close the LLM advisor's shared HTTP session
+        await close_llm_advisor()
+        
         logger.info("👋 AlumUnity API shutdown complete")
     except Exception as e:
         logger.error(f"❌ Shutdown error: {str(e)}")
@@ -1,5 +1,7 @@
 """Admin service for profile verification and management"""
 import logging
+import time
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import aiomysql
@@ -13,6 +15,17 @@ logger = logging.getLogger(__name__)
 class AdminService:
     """Service for admin operations"""
     
+    # Per-process cache for get_user_verification_status; the short TTL
+    # bounds staleness across workers, and verify/reject evict locally
+    STATUS_CACHE_SIZE = 2048
+    STATUS_CACHE_TTL = 5
+    _status_cache: "OrderedDict[str, tuple]" = OrderedDict()
+    
+    @staticmethod
+    def _invalidate_status(user_id: str):
+        """Drop a user's cached verification status"""
+        AdminService._status_cache.pop(user_id, None)
+    
     @staticmethod
     async def verify_profile(user_id: str, admin_id: str) -> Dict[str, Any]:
         """Verify alumni profile"""
@@ -53,8 +66,6 @@ class AdminService:
                     (user_id, admin_id, admin_id)
                 )
                 
-                await conn.commit()
-                
                 # Log admin action
                 await cursor.execute(
                     """
@@ -64,7 +75,6 @@ class AdminService:
                     """,
                     (admin_id, 'verification', 'profile', user_id, 'Approved profile verification')
                 )
-                await conn.commit()
                 
                 # Send notification to user
                 await cursor.callproc('send_notification', (
@@ -72,7 +82,11 @@ class AdminService:
                     'Your alumni profile has been verified by admin.', 
                     '/profile', 'high'
                 ))
+                
+                # One commit for the whole decision: it is applied atomically,
+                # and a failure part-way leaves nothing behind
                 await conn.commit()
+                AdminService._invalidate_status(user_id)
                 
                 return {"message": "Profile verified successfully", "user_id": user_id}
     
@@ -107,8 +121,6 @@ class AdminService:
                     (user_id, rejection_reason, admin_id, rejection_reason, admin_id)
                 )
                 
-                await conn.commit()
-                
                 # Log admin action
                 await cursor.execute(
                     """
@@ -120,7 +132,6 @@ class AdminService:
                      'Rejected profile verification', 
                      f'{{"reason": "{rejection_reason}"}}')
                 )
-                await conn.commit()
                 
                 # Send notification to user
                 await cursor.callproc('send_notification', (
@@ -128,7 +139,10 @@ class AdminService:
                     f'Your profile verification was rejected. Reason: {rejection_reason}', 
                     '/profile', 'high'
                 ))
+                
+                # Committed once so the rejection is applied atomically
                 await conn.commit()
+                AdminService._invalidate_status(user_id)
                 
                 return {
                     "message": "Profile verification rejected",
@@ -145,21 +159,8 @@ class AdminService:
                 # Get pending verifications or profiles that need verification
                 offset = (page - 1) * limit
                 
-                # Count total pending
-                await cursor.execute(
-                    """
-                    SELECT COUNT(*) as total
-                    FROM alumni_profiles ap
-                    LEFT JOIN profile_verification_requests pvr ON ap.user_id = pvr.user_id
-                    WHERE ap.is_verified = FALSE
-                    AND (pvr.status IS NULL OR pvr.status = 'pending')
-                    AND ap.profile_completion_percentage >= 70
-                    """
-                )
-                total_result = await cursor.fetchone()
-                total = total_result['total'] if total_result else 0
-                
-                # Get pending profiles with user info
+                # Get pending profiles with user info; COUNT(*) OVER() carries
+                # the pre-LIMIT total on every row so no separate COUNT query
                 await cursor.execute(
                     """
                     SELECT 
@@ -168,7 +169,8 @@ class AdminService:
                         u.role,
                         pvr.id as verification_request_id,
                         pvr.status as verification_status,
-                        pvr.created_at as request_created_at
+                        pvr.created_at as request_created_at,
+                        COUNT(*) OVER() as total_count
                     FROM alumni_profiles ap
                     JOIN users u ON ap.user_id = u.id
                     LEFT JOIN profile_verification_requests pvr ON ap.user_id = pvr.user_id
@@ -183,6 +185,28 @@ class AdminService:
                 
                 profiles = await cursor.fetchall()
                 
+                if profiles:
+                    total = profiles[0]['total_count']
+                    for profile in profiles:
+                        del profile['total_count']
+                elif offset:
+                    # Page past the end: no rows to read the total from
+                    await cursor.execute(
+                        """
+                        SELECT COUNT(*) as total
+                        FROM alumni_profiles ap
+                        JOIN users u ON ap.user_id = u.id
+                        LEFT JOIN profile_verification_requests pvr ON ap.user_id = pvr.user_id
+                        WHERE ap.is_verified = FALSE
+                        AND (pvr.status IS NULL OR pvr.status = 'pending')
+                        AND ap.profile_completion_percentage >= 70
+                        """
+                    )
+                    total_result = await cursor.fetchone()
+                    total = total_result['total'] if total_result else 0
+                else:
+                    total = 0
+                
                 # Parse JSON fields
                 from services.profile_service import ProfileService
                 parsed_profiles = [ProfileService._parse_profile_json_fields(p) for p in profiles]
@@ -250,6 +274,26 @@ class AdminService:
     @staticmethod
     async def get_user_verification_status(user_id: str) -> Optional[Dict[str, Any]]:
         """Get verification status for a specific user"""
+        cache = AdminService._status_cache
+        entry = cache.get(user_id)
+        if entry is not None:
+            expires_at, status = entry
+            if expires_at >= time.monotonic():
+                cache.move_to_end(user_id)
+                return status
+            del cache[user_id]
+        
+        status = await AdminService._fetch_user_verification_status(user_id)
+        
+        cache[user_id] = (time.monotonic() + AdminService.STATUS_CACHE_TTL, status)
+        cache.move_to_end(user_id)
+        if len(cache) > AdminService.STATUS_CACHE_SIZE:
+            cache.popitem(last=False)
+        return status
+    
+    @staticmethod
+    async def _fetch_user_verification_status(user_id: str) -> Optional[Dict[str, Any]]:
+        """Load a user's latest verification request from the database"""
         pool = await get_db_pool()
         async with pool.acquire() as conn:
             async with conn.cursor(aiomysql.DictCursor) as cursor:
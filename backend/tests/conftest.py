@@ -0,0 +1,6 @@
+"""Make backend modules importable the way the app imports them"""
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
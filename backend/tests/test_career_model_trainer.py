@@ -0,0 +1,70 @@
+"""Tests for CareerModelTrainer feature preparation"""
+import asyncio
+import warnings
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from ml.career_model_trainer import CareerModelTrainer
+from ml.model_loader import CareerModelLoader
+
+
+def _sample(i, skills):
+    return {
+        'from_role': ['Engineer', 'Analyst'][i % 2],
+        'to_role': ['Manager', 'Architect'][i % 2],
+        'industry': 'Technology',
+        'current_skills': skills,
+        'years_experience': i % 10,
+        'duration_months': 12,
+        'success_rating': 4,
+    }
+
+
+def test_rare_skills_are_dropped_from_vocabulary(tmp_path):
+    trainer = CareerModelTrainer(model_dir=str(tmp_path), min_skill_count=3)
+    data = [_sample(i, ['Python', f'rare-{i}']) for i in range(6)]
+
+    X, y = asyncio.run(trainer._prepare_features(data))
+
+    assert list(trainer.skill_encoder.classes_) == ['Python']
+    assert X.shape == (6, 6)
+    assert len(trainer.feature_names) == 6
+
+
+def test_all_rare_skills_train_without_skill_columns(tmp_path):
+    trainer = CareerModelTrainer(model_dir=str(tmp_path), min_skill_count=3)
+    data = [_sample(i, [f'rare-{i}', f'other-{i}']) for i in range(10)]
+
+    X, y = asyncio.run(trainer._prepare_features(data))
+
+    assert len(trainer.skill_encoder.classes_) == 0
+    assert X.shape == (10, 5)
+    assert X.dtype == np.float32
+    assert trainer.feature_names == [
+        'from_role_encoded',
+        'years_experience',
+        'transition_duration',
+        'success_rating',
+        'industry_encoded'
+    ]
+
+    # A model trained on that layout still serves predictions, without
+    # unknown-skill warnings
+    loader = CareerModelLoader(model_dir=str(tmp_path))
+    loader.model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    loader.encoders = {
+        'role_encoder': trainer.role_encoder,
+        'industry_encoder': trainer.industry_encoder,
+        'skill_encoder': trainer.skill_encoder,
+    }
+    loader._role_index = {r: i for i, r in enumerate(trainer.role_encoder.classes_.tolist())}
+    loader._industry_index = {r: i for i, r in enumerate(trainer.industry_encoder.classes_.tolist())}
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        predictions = loader.predict_batch([
+            {'current_role': 'Engineer', 'industry': 'Technology', 'skills': ['Python']}
+        ])
+
+    assert predictions is not None and len(predictions) == 1
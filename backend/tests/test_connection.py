@@ -0,0 +1,113 @@
+"""Tests for database.connection pooling helpers"""
+import asyncio
+
+import aiomysql
+import aiomysql.pool
+
+from database.connection import acquire_for_read
+
+
+class FakeReader:
+    eof_received = False
+
+    def at_eof(self):
+        return False
+
+    def exception(self):
+        return None
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def execute(self, query, params=None):
+        # autocommit=False: the first statement opens a transaction
+        self.conn.in_transaction = True
+        # Yield like a real round trip so concurrent reads overlap
+        await asyncio.sleep(0)
+
+    async def fetchone(self):
+        return {"count": 1}
+
+
+class FakeConnection:
+    """Just enough of aiomysql.Connection for aiomysql.Pool"""
+
+    def __init__(self):
+        self._reader = FakeReader()
+        self.last_usage = 0
+        self.closed = False
+        self.in_transaction = False
+
+    def cursor(self, cursor_class=None):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.in_transaction
+
+    async def rollback(self):
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+def _run_with_pool(monkeypatch, work):
+    opened = []
+
+    async def fake_connect(**kwargs):
+        conn = FakeConnection()
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(aiomysql.pool, "connect", fake_connect)
+
+    async def main():
+        pool = aiomysql.Pool(minsize=0, maxsize=5, echo=False, pool_recycle=-1, loop=asyncio.get_running_loop())
+        await work(pool)
+        return pool
+
+    pool = asyncio.run(main())
+    return pool, opened
+
+
+async def _read(pool):
+    async with acquire_for_read(pool) as conn:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute("SELECT COUNT(*) as count FROM users")
+            return await cursor.fetchone()
+
+
+def test_read_connections_return_to_pool(monkeypatch):
+    async def work(pool):
+        for _ in range(3):
+            await asyncio.gather(*(_read(pool) for _ in range(5)))
+
+    pool, opened = _run_with_pool(monkeypatch, work)
+
+    # Five concurrent reads, three times over, reuse the same five connections
+    assert len(opened) == 5
+    assert not any(conn.closed for conn in opened)
+    assert pool.freesize == 5
+
+
+def test_plain_acquire_drops_connections_left_in_transaction(monkeypatch):
+    async def work(pool):
+        for _ in range(3):
+            async with pool.acquire() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute("SELECT 1")
+
+    pool, opened = _run_with_pool(monkeypatch, work)
+
+    # What acquire_for_read guards against: every read costs a new connection
+    assert len(opened) == 3
+    assert all(conn.closed for conn in opened)
+    assert pool.freesize == 0
@@ -0,0 +1,68 @@
+"""Tests for If-None-Match handling in middleware.etag"""
+import asyncio
+
+from starlette.requests import Request
+
+from middleware import etag as etag_module
+from middleware.etag import etag_json_response, if_none_match
+
+ETAG = '"abc123"'
+
+
+def test_exact_match():
+    assert if_none_match('"abc123"', ETAG)
+
+
+def test_weak_validator_matches():
+    assert if_none_match('W/"abc123"', ETAG)
+
+
+def test_list_matches_any_entry():
+    assert if_none_match('"zzz", W/"abc123" ,"yyy"', ETAG)
+    assert not if_none_match('"zzz", "yyy"', ETAG)
+
+
+def test_star_matches():
+    assert if_none_match("*", ETAG)
+    assert if_none_match(" * ", ETAG)
+
+
+def test_missing_or_different_header():
+    assert not if_none_match(None, ETAG)
+    assert not if_none_match("", ETAG)
+    assert not if_none_match('"abc1234"', ETAG)
+
+
+def _request(if_none_match_header):
+    headers = []
+    if if_none_match_header is not None:
+        headers.append((b"if-none-match", if_none_match_header.encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_response_is_304_for_weak_and_listed_tags(monkeypatch):
+    store = {}
+
+    async def fake_get(key, prefix=""):
+        return store.get((prefix, key))
+
+    async def fake_set(key, value, ttl=None, prefix=""):
+        store[(prefix, key)] = value
+        return True
+
+    monkeypatch.setattr(etag_module.RedisCache, "get", staticmethod(fake_get))
+    monkeypatch.setattr(etag_module.RedisCache, "set", staticmethod(fake_set))
+
+    async def build_payload():
+        return {"success": True}
+
+    async def respond(header):
+        return await etag_json_response(_request(header), "k", build_payload)
+
+    first = asyncio.run(respond(None))
+    assert first.status_code == 200
+    tag = first.headers["etag"]
+
+    for header in (tag, "W/" + tag, '"other", ' + tag, "*"):
+        assert asyncio.run(respond(header)).status_code == 304
+    assert asyncio.run(respond('"other"')).status_code == 200
@@ -0,0 +1,92 @@
+"""Tests for the cache_response single-flight behaviour"""
+import asyncio
+
+import redis_client
+from redis_client import RedisCache, cache_response
+
+
+def _memory_cache(monkeypatch):
+    store = {}
+
+    async def fake_get(key, prefix=""):
+        return store.get((prefix, key))
+
+    async def fake_set(key, value, ttl=None, prefix=""):
+        store[(prefix, key)] = value
+        return True
+
+    monkeypatch.setattr(RedisCache, "get", staticmethod(fake_get))
+    monkeypatch.setattr(RedisCache, "set", staticmethod(fake_set))
+    return store
+
+
+def test_waiters_share_one_call(monkeypatch):
+    _memory_cache(monkeypatch)
+    calls = []
+
+    @cache_response(ttl=60)
+    async def lookup(x):
+        calls.append(x)
+        await asyncio.sleep(0.01)
+        return {"x": x}
+
+    async def main():
+        return await asyncio.gather(*(lookup(1) for _ in range(5)))
+
+    assert asyncio.run(main()) == [{"x": 1}] * 5
+    assert calls == [1]
+    assert redis_client._inflight == {}
+
+
+def test_cancelled_leader_does_not_fail_waiters(monkeypatch):
+    _memory_cache(monkeypatch)
+    calls = []
+
+    @cache_response(ttl=60)
+    async def lookup(x):
+        calls.append(x)
+        await asyncio.sleep(0.01)
+        return {"x": x}
+
+    async def main():
+        leader = asyncio.create_task(lookup(1))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(lookup(1)) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        # The leader's client disconnects mid-computation
+        leader.cancel()
+        results = await asyncio.gather(*waiters)
+        return leader, results
+
+    leader, results = asyncio.run(main())
+
+    assert leader.cancelled()
+    assert results == [{"x": 1}] * 3
+    # One waiter took over the computation for the rest
+    assert calls == [1, 1]
+    assert redis_client._inflight == {}
+
+
+def test_cancelled_waiter_does_not_affect_others(monkeypatch):
+    _memory_cache(monkeypatch)
+
+    @cache_response(ttl=60)
+    async def lookup(x):
+        await asyncio.sleep(0.01)
+        return {"x": x}
+
+    async def main():
+        leader = asyncio.create_task(lookup(1))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(lookup(1))
+        other = asyncio.create_task(lookup(1))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        return await leader, await other, waiter
+
+    leader_result, other_result, waiter = asyncio.run(main())
+
+    assert waiter.cancelled()
+    assert leader_result == other_result == {"x": 1}
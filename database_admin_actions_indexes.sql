@@ -0,0 +1,18 @@
+-- ============================================================================
+-- Admin Actions Indexes
+-- Purpose: Serve the audit-log list and stats queries from indexes
+--          instead of scanning and sorting admin_actions
+-- ============================================================================
+
+USE AlumUnity;
+
+-- ============================================================================
+-- AUDIT LOG LISTING: date window + filters, newest first
+-- ============================================================================
+-- Rows come back in index order for ORDER BY timestamp DESC, id DESC (and the
+-- before/before_id keyset cursor); the filter columns are checked in the index
+-- and cover the top-admins GROUP BY.
+-- Description search stays a LIKE '%...%' substring match, checked only on the
+-- rows inside the indexed date window
+CREATE INDEX idx_timestamp_filters
+    ON admin_actions (timestamp DESC, id DESC, action_type, admin_id, target_type);
@@ -0,0 +1,135 @@
+-- ============================================================================
+-- Admin Analytics Rollups
+-- Purpose: Precompute admin dashboard aggregates so the analytics endpoints
+--          read one row instead of scanning the underlying tables per request
+-- Requires: The rollups are refreshed by scheduled events, so the server must
+--           run with event_scheduler=ON (my.cnf or SET GLOBAL by a DBA). The
+--           API ignores rollups older than 15 minutes and aggregates live.
+-- ============================================================================
+
+USE AlumUnity;
+
+-- ============================================================================
+-- DASHBOARD STATS: single-row snapshot for GET /api/admin/analytics/dashboard
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS dashboard_stats (
+    id TINYINT PRIMARY KEY DEFAULT 1,
+    total_users INT NOT NULL DEFAULT 0,
+    active_users INT NOT NULL DEFAULT 0,
+    total_students INT NOT NULL DEFAULT 0,
+    total_alumni INT NOT NULL DEFAULT 0,
+    total_recruiters INT NOT NULL DEFAULT 0,
+    verified_alumni INT NOT NULL DEFAULT 0,
+    total_jobs INT NOT NULL DEFAULT 0,
+    active_jobs INT NOT NULL DEFAULT 0,
+    total_events INT NOT NULL DEFAULT 0,
+    published_events INT NOT NULL DEFAULT 0,
+    forum_posts INT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+DROP EVENT IF EXISTS refresh_dashboard_stats;
+
+-- Runs once on creation, then every 5 minutes
+CREATE EVENT refresh_dashboard_stats
+ON SCHEDULE EVERY 5 MINUTE
+DO
+    REPLACE INTO dashboard_stats (
+        id, total_users, active_users, total_students, total_alumni,
+        total_recruiters, verified_alumni, total_jobs, active_jobs,
+        total_events, published_events, forum_posts, refreshed_at
+    )
+    SELECT
+        1,
+        u.total_users, u.active_users, u.total_students, u.total_alumni,
+        u.total_recruiters,
+        (SELECT COUNT(*) FROM alumni_profiles WHERE is_verified = TRUE),
+        j.total_jobs, j.active_jobs,
+        e.total_events, e.published_events,
+        (SELECT COUNT(*) FROM forum_posts WHERE is_deleted = FALSE),
+        NOW()
+    FROM (
+        SELECT
+            COUNT(*) AS total_users,
+            COALESCE(SUM(is_active = TRUE), 0) AS active_users,
+            COALESCE(SUM(role = 'student'), 0) AS total_students,
+            COALESCE(SUM(role = 'alumni'), 0) AS total_alumni,
+            COALESCE(SUM(role = 'recruiter'), 0) AS total_recruiters
+        FROM users
+    ) u
+    CROSS JOIN (
+        SELECT
+            COUNT(*) AS total_jobs,
+            COALESCE(SUM(status = 'active'), 0) AS active_jobs
+        FROM jobs
+    ) j
+    CROSS JOIN (
+        SELECT
+            COUNT(*) AS total_events,
+            COALESCE(SUM(status = 'published'), 0) AS published_events
+        FROM events
+    ) e;
+
+-- ============================================================================
+-- ENGAGEMENT ROLLUP: active-user counts for GET /api/admin/analytics/engagement
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS engagement_rollup (
+    id TINYINT PRIMARY KEY DEFAULT 1,
+    daily_active INT NOT NULL DEFAULT 0,
+    weekly_active INT NOT NULL DEFAULT 0,
+    monthly_active INT NOT NULL DEFAULT 0,
+    total_users INT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ============================================================================
+-- TOP CONTRIBUTORS: ranked top 50 for GET /api/admin/analytics/top-contributors
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS top_contributors (
+    position SMALLINT PRIMARY KEY,
+    user_id VARCHAR(50) NOT NULL,
+    email VARCHAR(255),
+    name VARCHAR(255),
+    contributions INT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+DROP EVENT IF EXISTS refresh_engagement_rollups;
+
+DELIMITER //
+
+-- Runs once on creation, then every minute
+CREATE EVENT refresh_engagement_rollups
+ON SCHEDULE EVERY 1 MINUTE
+DO
+BEGIN
+    REPLACE INTO engagement_rollup (
+        id, daily_active, weekly_active, monthly_active, total_users, refreshed_at
+    )
+    SELECT
+        1,
+        COUNT(CASE WHEN last_login >= DATE_SUB(NOW(), INTERVAL 1 DAY) THEN 1 END),
+        COUNT(CASE WHEN last_login >= DATE_SUB(NOW(), INTERVAL 7 DAY) THEN 1 END),
+        COUNT(CASE WHEN last_login >= DATE_SUB(NOW(), INTERVAL 30 DAY) THEN 1 END),
+        COUNT(*),
+        NOW()
+    FROM users
+    WHERE is_active = TRUE;
+
+    -- Swap the ranking atomically so readers never see a partial list
+    START TRANSACTION;
+    DELETE FROM top_contributors;
+    INSERT INTO top_contributors (position, user_id, email, name, contributions, refreshed_at)
+    SELECT
+        ROW_NUMBER() OVER (ORDER BY es.total_score DESC),
+        u.id, u.email, ap.name, es.total_score, NOW()
+    FROM users u
+    LEFT JOIN alumni_profiles ap ON u.id = ap.user_id
+    JOIN engagement_scores es ON u.id = es.user_id
+    WHERE es.total_score IS NOT NULL
+    ORDER BY es.total_score DESC
+    LIMIT 50;
+    COMMIT;
+END //
+
+DELIMITER ;
@@ -444,7 +444,8 @@ CREATE TABLE admin_actions (
     FOREIGN KEY (admin_id) REFERENCES users(id) ON DELETE CASCADE,
     INDEX idx_admin_id (admin_id),
     INDEX idx_action_type (action_type),
-    INDEX idx_timestamp (timestamp)
+    INDEX idx_timestamp (timestamp),
+    INDEX idx_timestamp_filters (timestamp DESC, id DESC, action_type, admin_id, target_type)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- System metrics